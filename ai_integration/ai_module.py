@@ -25,33 +25,47 @@ clean API index pages.
 
    parse_bool_env
    _find_courses_json
+   _find_courses_json_cached
+   _load_courses_json_bytes
    _parse_degree_electives_csv
    main_int_ai
    main_test_ai
    get_recommendations_ai
+   get_recommendations_ai_batch
    fake_chatgpt_response
+   fake_chatgpt_response_bytes
    real_chatgpt_response
+   real_chatgpt_response_batch
+   aget_recommendations_ai
+   gather_recommendations
 """
 
+import asyncio
+import functools
+import hashlib
 import importlib.util
 import json
 import logging
 import os
 import re
+import sqlite3
 import sys
+import threading
+import time
+import warnings
 from typing import TYPE_CHECKING, Any, Optional
 
 logger = logging.getLogger(__name__)
 
-import csv
-import io
-import textwrap
-
 # ----------------------------- NEW IMPORTS/HELPERS -----------------------------
+from importlib import resources
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple, Union
 
-from langchain.prompts import ChatPromptTemplate
+try:  # Optional fast JSON backend; stdlib json is used when it is absent
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 if TYPE_CHECKING:
     from langchain_openai import ChatOpenAI
@@ -60,6 +74,64 @@ if TYPE_CHECKING:
 # Explicit module-level globals so other functions can guard against uninitialized state
 model: Optional["ChatOpenAI"] = None  # Added Code
 prompt_template: Optional[Any] = None  # Added Code
+json_prompt_template: Optional[Any] = None  # prompt for JSON-mode replies
+
+# Serializes main_int_ai so concurrent callers build the client/template only once
+_init_lock = threading.Lock()
+
+# (path, content digest, mtime_ns, size) of the last courses.json this process wrote
+_last_courses_json_write: Optional[Tuple[str, bytes, int, int]] = None
+
+# Column layout of elective CSV text (see _parse_degree_electives_csv)
+_ELECTIVE_CSV_FIELDNAMES: Tuple[str, ...] = (
+    "Prereq1",
+    "Prereq2",
+    "Prereq3",
+    "Course Code",
+    "Units",
+    "Course Name",
+    "Description",
+)
+
+# Tokens accepted as "true" by parse_bool_env
+_TRUTHY: frozenset[str] = frozenset(("1", "true", "yes", "y", "on", "t"))
+
+# Integer literal (e.g. "7"): CSV Units, and Number/Rating in model replies
+_INT_RE = re.compile(r"[-+]?\d+")
+
+# courses.json locations relative to this file (project root, then its parent),
+# probed by _find_courses_json after the working directory
+_HERE: Path = Path(__file__).resolve()
+_PACKAGE_COURSES_JSON_CANDIDATES: Tuple[Path, ...] = (
+    _HERE.parents[1] / "courses.json",
+    _HERE.parents[2] / "courses.json",
+)
+_PACKAGE_COURSES_JSON_CANDIDATE_STRS: Tuple[str, ...] = tuple(
+    map(str, _PACKAGE_COURSES_JSON_CANDIDATES)
+)
+
+# Recommendation Numbers that option 4 expects to find ({1..10}), as bits 1..10
+_REQUIRED_NUMBERS_MASK: int = (1 << 11) - 2
+
+# "**Key:** value" line in the model's markdown reply, plus any continuation
+# lines up to the next key line (parse_course_data scans all lines at once)
+_COURSE_BLOCK_RE = re.compile(
+    r"^\*\*(.+?):\*\*[ \t]*(.*(?:\n(?!\*\*.+?:\*\*).*)*)", re.MULTILINE
+)
+
+# Prefix of the prerequisites line; text up to the next colon is a status label
+_PREREQ_PREFIX = "**Prerequisites:**"
+
+# Response cache for identical real-mode requests (AI_CACHE_ENABLED); entries
+# expire after a week. Stored next to the app database unless AI_CACHE_PATH is set.
+_LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+_LLM_CACHE_DEFAULT_RELPATH: Tuple[str, str] = ("db", "llm_cache.db")
+
+# One prompt line per elective: "<3 prereq slots>,Course,Units,Name,Description"
+_ELECTIVE_LINE_FMT = "{},{},{},{},{}".format
+
+# Per-job section marker in batched model replies, e.g. "===JOB 3==="
+_BATCH_JOB_RE = re.compile(r"^\s*===\s*JOB\s+(\S+?)\s*===\s*$", re.MULTILINE)
 
 
 def parse_bool_env(name: str, default: bool = False) -> bool:
@@ -74,38 +146,193 @@ def parse_bool_env(name: str, default: bool = False) -> bool:
               otherwise ``False``.
     :rtype: bool
     """
-    val = os.getenv(name, str(default))
-    return str(val).strip().lower() in {
-        "1",
-        "true",
-        "yes",
-        "y",
-        "on",
-        "t",
-    }
+    value = os.getenv(name)
+    if value is None:
+        return default  # unset: no string work at all
+    return value.strip().lower() in _TRUTHY
 
 
 def _find_courses_json() -> Path:
     """Locate the bundled ``courses.json`` data file.
 
     Searches several locations relative to this file and the current working
-    directory, returning the first existing path.
+    directory, returning the first one that is a regular file.
 
     :returns: Resolved path where ``courses.json`` is found (or the primary
               candidate if none exist, for error context).
     :rtype: :class:`pathlib.Path`
     """
 
-    candidates = [
-        Path.cwd() / "courses.json",
-        Path(__file__).resolve().parents[1] / "courses.json",
-        Path(__file__).resolve().parents[2] / "courses.json",
-    ]
-    for p in candidates:
-        if p.exists():
+    # The working directory can change at runtime; the package-relative
+    # candidates are resolved once at import (_PACKAGE_COURSES_JSON_CANDIDATES).
+    # os.path.isfile on plain strings: one stat per candidate, no Path objects.
+    primary = os.path.join(os.getcwd(), "courses.json")
+    if os.path.isfile(primary):
+        return Path(primary)
+    for p, p_str in zip(
+        _PACKAGE_COURSES_JSON_CANDIDATES, _PACKAGE_COURSES_JSON_CANDIDATE_STRS
+    ):
+        if os.path.isfile(p_str):
             return p
     # Fall back to first candidate (for error message context)
-    return candidates[0]
+    return Path(primary)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_courses_json_memo() -> Path:
+    """Last result of :func:`_find_courses_json` (see
+    :func:`_find_courses_json_cached`)."""
+    return _find_courses_json()
+
+
+def _find_courses_json_cached() -> Path:
+    """Memoized :func:`_find_courses_json` that never pins a missing file.
+
+    A remembered path is reused while it is still a regular file (one ``stat``
+    instead of up to three). If it is not, e.g. the not-found fallback before
+    real mode first writes ``courses.json``, or a file that was removed, the
+    candidates are probed again.
+
+    :returns: Resolved path where ``courses.json`` is found (or the primary
+              candidate if none exist, for error context).
+    :rtype: :class:`pathlib.Path`
+    """
+    path = _find_courses_json_memo()
+    if not os.path.isfile(path):
+        _find_courses_json_memo.cache_clear()
+        path = _find_courses_json_memo()
+    return path
+
+
+@functools.lru_cache(maxsize=1)
+def _load_test_electives_csv() -> str:
+    """Load the sample elective CSV used by the option-4 self-test.
+
+    The file ships next to this module as ``test_electives.csv`` and is read
+    once on first use.
+
+    :returns: CSV text in the ``Prereq1,Prereq2,Prereq3,Course,Units,Name,Description`` layout.
+    :rtype: str
+    """
+    return (
+        resources.files(__package__)
+        .joinpath("test_electives.csv")
+        .read_text(encoding="utf-8")
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_available() -> bool:
+    """Return whether the ``openai`` package can be imported.
+
+    ``importlib.util.find_spec`` walks ``sys.path``; the answer does not change
+    during the process lifetime, so it is computed once.
+
+    :rtype: bool
+    """
+    return importlib.util.find_spec("openai") is not None
+
+
+def _write_courses_json(json_bytes: bytes, path: str = "courses.json") -> bool:
+    """Write recommendations JSON atomically, skipping unchanged content.
+
+    The bytes go to ``<path>.tmp`` and are moved into place with
+    :func:`os.replace`, so readers never see a half-written file. If the file
+    this process last wrote is still on disk untouched (same mtime and size)
+    and the new content hashes the same, nothing is written.
+
+    :returns: ``True`` if the file was written, ``False`` if it was up to date.
+    :rtype: bool
+    """
+    global _last_courses_json_write
+    target = os.path.abspath(path)
+    digest = hashlib.blake2b(json_bytes, digest_size=16).digest()
+    last = _last_courses_json_write
+    if last is not None and last[:2] == (target, digest):
+        try:
+            st = os.stat(target)
+        except OSError:
+            st = None
+        if st is not None and (st.st_mtime_ns, st.st_size) == last[2:]:
+            return False
+
+    tmp = target + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(json_bytes)
+    os.replace(tmp, target)
+    st = os.stat(target)
+    _last_courses_json_write = (target, digest, st.st_mtime_ns, st.st_size)
+    return True
+
+
+def _publish_courses_json(json_bytes: bytes) -> None:
+    """Write real-mode recommendations to ``courses.json`` and log the outcome."""
+    if _write_courses_json(json_bytes):
+        logger.info("AI recommendations written to courses.json")
+    else:
+        logger.info("courses.json already up to date; write skipped")
+
+
+def refresh_env() -> None:
+    """Drop values cached from the process environment.
+
+    ``openai`` availability is looked up once per process; call this after
+    installing packages or editing ``sys.path`` at runtime so the next check
+    sees the change. ``OPENAI_API_KEY`` is not cached and needs no refresh.
+    """
+    _openai_available.cache_clear()
+
+
+def _dumps_json_bytes(obj: Any) -> bytes:
+    """Serialize recommendations as pretty-printed UTF-8 JSON (2-space indent).
+
+    Uses ``orjson`` when installed; the stdlib fallback is configured to give
+    the same layout (``indent=2``, non-ASCII kept as-is).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_json(obj: Any) -> str:
+    """Text form of :func:`_dumps_json_bytes`."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _loads_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON text, using ``orjson`` when installed.
+
+    :raises json.JSONDecodeError: On malformed input (``orjson.JSONDecodeError``
+        is a subclass).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_courses_json_bytes(path: Path, mtime_ns: int, size: int) -> bytes:
+    """Read and validate ``courses.json``, memoized per file version.
+
+    ``mtime_ns`` and ``size`` are part of the cache key only, so an edited file
+    is re-read on the next call. Errors are not cached.
+
+    :returns: Raw UTF-8 JSON bytes of the file.
+    :rtype: bytes
+    :raises json.JSONDecodeError: If the JSON file is malformed.
+    """
+    # Pass the file bytes through as-is; parse only to validate them.
+    raw = path.read_bytes()
+    _loads_json(raw)
+    return raw
+
+
+def _invalidate_courses_json_cache() -> None:
+    """Clear the memoized ``courses.json`` location and payload (used by tests)."""
+    _find_courses_json_memo.cache_clear()
+    _load_courses_json_bytes.cache_clear()
 
 
 def _combine_prereqs(p1: str, p2: str, p3: str) -> str:
@@ -115,14 +342,41 @@ def _combine_prereqs(p1: str, p2: str, p3: str) -> str:
       - ["CPSC 351 or CPSC 353", "", ""] -> "CPSC 351 or CPSC 353"
       - ["", "", ""] -> "None"
     """
-    parts = [s.strip() for s in (p1 or "", p2 or "", p3 or "") if s and s.strip()]
-    if not parts:
-        return "None"
-    if len(parts) == 1:
-        return parts[0]
-    # If there are 2+, prefer ", ".join(head) + " or tail" for readability.
-    head, tail = parts[:-1], parts[-1]
-    return f"{', '.join(head)} or {tail}"
+    a = p1.strip() if p1 else ""
+    b = p2.strip() if p2 else ""
+    c = p3.strip() if p3 else ""
+    # Only eight shapes exist, so branch on them instead of building a list.
+    if a and b and c:
+        return f"{a}, {b} or {c}"
+    if a and b:
+        return f"{a} or {b}"
+    if a and c:
+        return f"{a} or {c}"
+    if b and c:
+        return f"{b} or {c}"
+    return a or b or c or "None"
+
+
+def _elective_from_fields(fields: Sequence[str]) -> Dict[str, Any]:
+    """Build a canonical elective row from the seven positional CSV fields.
+
+    :param fields: ``(Prereq1, Prereq2, Prereq3, Course Code, Units, Course Name,
+        Description)`` values, already stripped.
+    :returns: Dict with keys prerequisites, course_code, units, name, description.
+    """
+    p1, p2, p3, course_code, units, name, description = fields
+    try:
+        units = int(units) if units not in ("", None) else None
+    except Exception:
+        units = None
+
+    return {
+        "prerequisites": _combine_prereqs(p1, p2, p3),
+        "course_code": course_code,
+        "units": units,
+        "name": name,
+        "description": description,
+    }
 
 
 def _normalize_elective_row(old: Dict[str, Any]) -> Dict[str, Any]:
@@ -133,29 +387,26 @@ def _normalize_elective_row(old: Dict[str, Any]) -> Dict[str, Any]:
         return old
 
     # CSV/legacy keys -> canonical keys
-    prereqs = _combine_prereqs(
-        old.get("Prereq1", ""),
-        old.get("Prereq2", ""),
-        old.get("Prereq3", ""),
+    return _elective_from_fields(
+        (
+            old.get("Prereq1", ""),
+            old.get("Prereq2", ""),
+            old.get("Prereq3", ""),
+            str(old.get("Course Code", "")).strip(),
+            old.get("Units", None),
+            str(old.get("Course Name", "")).strip(),
+            str(old.get("Description", "")).strip(),
+        )
     )
-    units = old.get("Units", None)
-    try:
-        units = int(units) if units not in ("", None) else None
-    except Exception:
-        units = None
-
-    return {
-        "prerequisites": prereqs,
-        "course_code": str(old.get("Course Code", "")).strip(),
-        "units": units,
-        "name": str(old.get("Course Name", "")).strip(),
-        "description": str(old.get("Description", "")).strip(),
-    }
 
 
-def _parse_degree_electives_csv(csv_text: str) -> List[Dict[str, Any]]:
+def _parse_degree_electives_csv(csv_text: Union[str, TextIO]) -> List[Dict[str, Any]]:
     """Parse elective rows from CSV text into structured records.
 
+    ``csv_text`` may be a string or an open text stream (e.g. a file opened
+    with ``newline=""``); streams are handed to the parser as-is instead of
+    being copied into an intermediate buffer.
+
     The incoming CSV may have up to seven columns: Prereq1, Prereq2, Prereq3,
     Course Code, Units, Course Name, Description. This parser normalizes them
     into the canonical schema used by the AI layer:
@@ -166,80 +417,87 @@ def _parse_degree_electives_csv(csv_text: str) -> List[Dict[str, Any]]:
       - description: string
     """
 
-    fieldnames = [
-        "Prereq1",
-        "Prereq2",
-        "Prereq3",
-        "Course Code",
-        "Units",
-        "Course Name",
-        "Description",
-    ]
-    reader = csv.reader(io.StringIO(csv_text))
-    rows: List[Dict[str, Any]] = []
-    for raw in reader:
-        if not raw or all(not str(x).strip() for x in raw):
-            continue
-        row = list(raw) + [""] * (len(fieldnames) - len(raw))
-        row = row[: len(fieldnames)]
+    import io
 
-        tmp: Dict[str, Any] = {}
-        for key, val in zip(fieldnames, row):
-            s = str(val).strip()
-            tmp[key] = s
+    import pandas as pd  # Local import: pandas is heavy and only needed here
 
-        # Convert to canonical shape
-        rows.append(_normalize_elective_row(tmp))
+    source = io.StringIO(csv_text) if isinstance(csv_text, str) else csv_text
+    try:
+        with warnings.catch_warnings():
+            # Rows with more than seven fields are truncated to the known columns.
+            warnings.simplefilter("ignore", pd.errors.ParserWarning)
+            df = pd.read_csv(
+                source,
+                header=None,
+                names=_ELECTIVE_CSV_FIELDNAMES,
+                index_col=False,
+                dtype=str,
+                keep_default_na=False,
+                skip_blank_lines=True,
+            )
+    except pd.errors.EmptyDataError:
+        return []
+
+    # Whitespace strip runs column-wise in C; then drop rows with no content at all.
+    df = df.fillna("").apply(lambda col: col.str.strip())
+    df = df[df.ne("").any(axis=1)]
+    if df.empty:
+        return []
+
+    # Units: integer strings only (same rule as int() on a stripped cell), else None.
+    units = df["Units"]
+    units = pd.to_numeric(
+        units.where(units.str.fullmatch(_INT_RE.pattern)), errors="coerce"
+    ).astype("Int64")
+    units = units.astype(object).where(units.notna(), None)
+
+    # Prerequisites: same output as _combine_prereqs, built column-wise (pandas only).
+    a, b, c = df["Prereq1"], df["Prereq2"], df["Prereq3"]
+    has_a, has_b, has_c = a.ne(""), b.ne(""), c.ne("")
+    # Later masks win, so the shapes are applied from least to most specific.
+    prerequisites = (
+        pd.Series("None", index=df.index)
+        .mask(has_c, c)
+        .mask(has_b, b)
+        .mask(has_a, a)
+        .mask(has_b & has_c, b + " or " + c)
+        .mask(has_a & has_c, a + " or " + c)
+        .mask(has_a & has_b, a + " or " + b)
+        .mask(has_a & has_b & has_c, a + ", " + b + " or " + c)
+    )
+
+    rows: List[Dict[str, Any]] = [
+        {
+            "prerequisites": prereq,
+            "course_code": course_code,
+            "units": unit,
+            "name": name,
+            "description": description,
+        }
+        for prereq, course_code, unit, name, description in zip(
+            prerequisites.tolist(),
+            df["Course Code"].tolist(),
+            units.tolist(),
+            df["Course Name"].tolist(),
+            df["Description"].tolist(),
+        )
+    ]
 
     logger.debug("Parsed %d elective rows (normalized)", len(rows))
-    for r in rows:
-        logger.debug(r)
+    if logger.isEnabledFor(logging.DEBUG):
+        for r in rows:
+            logger.debug(r)
     return rows
 
 
 # -------------------------------------------------------------------------------
 
 
-def main_int_ai() -> bool:
-    """Initialize the AI integration layer.
-
-    In production this would set up model clients, keys, and rate-limiters.
-    Currently it validates presence of ``OPENAI_API_KEY`` and logs status.
-
-    :returns: ``True`` if an API key is present; ``False`` otherwise.
-    :rtype: bool
-    """
-
-    global model, prompt_template
-
-    logger.info("Initializing AI Module...")
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        logger.warning("OPENAI_API_KEY not set; AI features disabled.")
-        return False
-    logger.info("AI configuration found (client initialization placeholder).")
-
-    try:
-        from langchain_openai import (
-            ChatOpenAI,
-        )  # Local import to allow test mode without langchain
-
-        # Create a ChatOpenAI model
-        model = ChatOpenAI(model="gpt-4o")
-    except Exception as e:
-        logger.error(f"Error creating ChatOpenAI model: {e}")
-        return False
-
-    # Prompt with System and Human Messages (Using Tuples)
-    logger.info("\n----- Setup Prompt with System and Human Messages (Tuple) -----\n")
-    # Prompt with System and Human Messages (Using Tuples)
-    # < career path> p_career_path
-    # <START Electives> p_electives
-    # < degree> p_degree
-    messages = [
-        (
-            "system",
-            """Role: College counselor
+# Prompt with System and Human Messages (Using Tuples), built once at import.
+# < career path> p_career_path
+# <START Electives> p_electives
+# < degree> p_degree
+_SYSTEM_PROMPT = """Role: College counselor
     Response length: detailed
     Explanation for each elective: Provide detailed explanations for each recommended elective course, ensuring that each explanation falls within a word count range of 100 to 200 words. These explanations should comprehensively address why the elective is beneficial.
     Response Style and Voice: detailed and academic style of the response should help the student understand the importance and relevance of each elective to their career of {p_career_path}.
@@ -270,15 +528,89 @@ def main_int_ai() -> bool:
     For each Prerequisite show “Need to take:” or “Completed:” base on the user input of class completed. Example: Completed CPSC 131, MATH 270B, etc.
     These suggestions not only consider the student's academic history and preferences but also the potential career paths they might be interested in, such as web development, AI engineering, machine learning, or game development.
     The system aims to streamline the decision-making process, ensuring students make informed choices that will benefit their future career trajectories.
-    """,
-        ),
-        (
-            "human",
-            "Here are the electives I has to choose from in the format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description' {p_electives} .",
-        ),
-    ]
+    """
+
+_HUMAN_PROMPT = "Here are the electives I has to choose from in the format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description' {p_electives} ."
+
+_PROMPT_MESSAGES: Tuple[Tuple[str, str], ...] = (
+    ("system", _SYSTEM_PROMPT),
+    ("human", _HUMAN_PROMPT),
+)
+
+# JSON mode: overrides the markdown "Response output" layout above. Braces are
+# doubled because the text goes through ChatPromptTemplate formatting.
+_JSON_OUTPUT_PROMPT = """Output format override: ignore the markdown response layout above and reply with a single JSON object only, no prose and no code fences.
+    The object has one key, "courses", whose value is an array with one object per recommended elective, sorted by Rating from best to worst:
+    {{"Number": 1, "Course Code": "CPSC 483", "Course Name": "Introduction to Machine Learning", "Rating": 100, "Explanation": "...", "Prerequisites": "CPSC 335, MATH 338"}}
+    Number and Rating are integers. Prerequisites is "None" when there are none.
+    """
+
+_JSON_PROMPT_MESSAGES: Tuple[Tuple[str, str], ...] = (
+    ("system", _SYSTEM_PROMPT),
+    ("system", _JSON_OUTPUT_PROMPT),
+    ("human", _HUMAN_PROMPT),
+)
+
+# OpenAI JSON mode: the reply is guaranteed to be one syntactically valid JSON object
+_JSON_RESPONSE_FORMAT: Dict[str, str] = {"type": "json_object"}
+
+
+def main_int_ai() -> bool:
+    """Initialize the AI integration layer.
+
+    In production this would set up model clients, keys, and rate-limiters.
+    Currently it validates presence of ``OPENAI_API_KEY`` and logs status.
+    The model client and prompt templates (markdown and JSON-mode) are built
+    once and reused by later calls; initialization is guarded by a lock so it
+    is safe across threads.
+
+    :returns: ``True`` if an API key is present; ``False`` otherwise.
+    :rtype: bool
+    """
+
+    global model, prompt_template, json_prompt_template
+
+    logger.info("Initializing AI Module...")
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logger.warning("OPENAI_API_KEY not set; AI features disabled.")
+        return False
+
+    with _init_lock:
+        if (
+            model is not None
+            and prompt_template is not None
+            and json_prompt_template is not None
+        ):
+            logger.debug("AI Integration already initialized; reusing client.")
+            return True
+
+        logger.info("AI configuration found (client initialization placeholder).")
+
+        try:
+            from langchain_openai import (
+                ChatOpenAI,
+            )  # Local import to allow test mode without langchain
+
+            # Create a ChatOpenAI model
+            chat_model = ChatOpenAI(model="gpt-4o")
+        except Exception as e:
+            logger.error("Error creating ChatOpenAI model: %s", e)
+            return False
+
+        # Prompt with System and Human Messages (Using Tuples)
+        logger.info(
+            "\n----- Setup Prompt with System and Human Messages (Tuple) -----\n"
+        )
+
+        # Local import: langchain takes most of this module's import time
+        from langchain.prompts import ChatPromptTemplate
 
-    prompt_template = ChatPromptTemplate.from_messages(messages)
+        # Publish together so the fast path above never sees half a setup.
+        prompt_template = ChatPromptTemplate.from_messages(_PROMPT_MESSAGES)
+        json_prompt_template = ChatPromptTemplate.from_messages(_JSON_PROMPT_MESSAGES)
+        _build_prompt.cache_clear()  # rendered prompts belong to the old templates
+        model = chat_model
 
     logger.info("AI Integration Initialized done.")
 
@@ -302,13 +634,12 @@ def main_test_ai(option: int) -> bool:
     """
     logger.info("Running AI module test...")
 
-    api_key = os.getenv("OPENAI_API_KEY")
-
     if option == 1:
         ret_value = main_int_ai()
         return ret_value
 
     elif option == 2:
+        api_key = os.getenv("OPENAI_API_KEY")  # read live; tests/CLI may change it
         if not api_key:
             logger.warning("main_test_ai option 2: OPENAI_API_KEY not set.")
             return False
@@ -317,8 +648,7 @@ def main_test_ai(option: int) -> bool:
         return True
 
     elif option == 3:
-        spec = importlib.util.find_spec("openai")
-        if spec is None:
+        if not _openai_available():
             logger.warning("main_test_ai option 3: 'openai' package not found.")
             return False
         logger.info("main_test_ai option 3: 'openai' package is installed.")
@@ -326,60 +656,22 @@ def main_test_ai(option: int) -> bool:
     ################################################################S
     elif option == 4:
         try:
-            # Provided CSV lines (kept verbatim; parser handles quotes/commas)
-            # Build CSV safely using triple *single* quotes so embedded "..." in CSV don't clash.
-            csv_text = """ 
-            CPSC 335,MATH 338,,CPSC 483,3,Introduction to Machine Learning,"Design, implement and analyze machine learning algorithms, including supervised learning and unsupervised learning algorithms. Methods to address uncertainty. Projects with real-world data." 
-            CPSC 131,MATH 338,,CPSC 375,3,Introduction to Data Science and Big Data ,"Techniques for data preparation, exploratory analysis, statistical modeling, machine learning and visualization. Methods for analyzing different types of data, such as natural language and time-series, from emerging applications, including Internet-of-Things. Big data platforms. Projects with real-world data." 
-            CPSC 131,,,CPSC 485,3,Computational Bioinformatics,"Algorithmic approaches to biological problems. Specific topics include motif finding, genome rearrangement, DNA sequence comparison, sequence alignment, DNA sequencing, repeat finding and gene expression analysis." 
-            MATH 270B,CPSC 131,,CPSC 452,3,Cryptography,"Introduction to cryptography and steganography. Encryption, cryptographic hashing, certificates, and signatures. Classical, symmetric-key, and public-key ciphers. Block modes of operation. Cryptanalysis including exhaustive search, man-in-the-middle, and birthday attacks. Programing projects involving implementation of cryptographic systems." 
-            CPSC 351, CPSC 353,,CPSC 454,3,Cloud Computing and Security,"Cloud computing and cloud security, distributed computing, computer clusters, grid computing, virtual machines and virtualization, cloud computing platforms and deployment models, cloud programming and software environments, vulnerabilities and risks of cloud computing, cloud infrastructure protection, data privacy and protection." 
-            CPSC 351 or CPSC 353,,,CPSC 455,3,Web Security,"Concepts of web application security. Web security mechanisms, including authentication, access control and protecting sensitive data. Common vulnerabilities, including code and SQL attacks, cross-site scripting and cross-site request forgery. Implement hands-on web application security mechanisms and security testing." 
-            CPSC 351,,,CPSC 474,3,Parallel and Distributed Computing,"Concepts of distributed computing; distributed memory and shared memory architectures; parallel programming techniques; inter-process communication and synchronization; programming for parallel architectures such as multi-core and GPU platforms; project involving distributed application development." 
-            CPSC 351,,,CPSC 479,3,Introduction to High Performance Computing,"Introduction to the concepts of high-performance computing and the paradigms of parallel programming in a high level programming language, design and implementation of parallel algorithms on distributed memory, machine learning techniques on large data sets, implementation of parallel algorithms." 
-            CPSC 121 or MATH 320,MATH 270B or MATH 280,,CPSC 439,3,Theory of Computation,"Introduction to the theory of computation. Automata theory; finite state machines, context free grammars, and Turing machines; hierarchy of formal language classes. Computability theory and undecidable problems. Time complexity; P and NP-complete problems. Applications to software design and security." 
-            MATH 250A ,,,MATH 335,3,Mathematical Probability,"Probability theory; discrete, continuous and multivariate probability distributions, independence, conditional probability distribution, expectation, moment generating functions, functions of random variables and the central limit theorem." 
-            CPSC 131, MATH 150B, MATH 270B,CPSC 484,3,Principles of Computer Graphics,"Examine and analyze computer graphics, software structures, display processor organization, graphical input/output devices, display files. Algorithmic techniques for clipping, windowing, character generation and viewpoint transformation." 
-            ,,,CPSC 499,3,Independent Study,"Special topic in computer science, selected in consultation with and completed under the supervision of instructor. May be repeated for a maximum of 9 units of Undergraduate credit and 6 units of Graduate credit. Requires approval by the Computer Science chair." 
-            CPSC 351,CPSC 353 or CPSC 452,,CPSC 459,3,Blockchain Technologies,"Digital assets as a medium of exchange to secure financial transactions; decentralized and distributed ledgers that record verifiable transactions; smart contracts and Ethereum; Bitcoin mechanics and mining; the cryptocurrency ecosystem; blockchain mechanics and applications." 
-            MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 370,3,Mathematical Model Building,"Introduction to mathematical models in science and engineering: dimensional analysis, discrete and continuous dynamical systems, flow and diffusion models." 
-            MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 340,,Numerical Analysis,"Approximate numerical solutions of systems of linear and nonlinear equations, interpolation theory, numerical differentiation and integration, numerical solution of ordinary differential equations. Computer coding of numerical methods." 
-            CPSC 351,,,CPSC 456,3,Network Security Fundamentals,"Learn about vulnerabilities of network protocols, attacks targeting confidentiality, integrity and availability of data transmitted across networks, and methods for diagnosing and closing security gaps through hands-on exercises." 
-            CPSC 351,,,CPSC 458,3,Malware Analysis,"Introduction to principles and practices of malware analysis. Topics include static and dynamic code analysis, data decoding, analysis tools, debugging, shellcode analysis, reverse engineering of stealthy malware and written presentation of analysis results." 
-            CPSC 332,,,CPSC 431,3,Database and Applications,"Database design and application development techniques for a real world system. System analysis, requirement specifications, conceptual modeling, logic design, physical design and web interface development. Develop projects using contemporary database management system and web-based application development platform." 
-            CPSC 332,,,CPSC 449,3,Web Back-End Engineering,"Design and architecture of large-scale web applications. Techniques for scalability, session management and load balancing. Dependency injection, application tiers, message queues, web services and REST architecture. Caching and eventual consistency. Data models, partitioning and replication in relational and non-relational databases." 
-            CPSC 240,,,CPSC 440,3,Computer System Architecture,"Computer performance, price/performance, instruction set design and examples. Processor design, pipelining, memory hierarchy design and input/output subsystems." 
-            CPSC 131 ,,,CPSC 349 ,3, Web Front-End Engineering ,"Concepts and architecture of interactive web applications, including markup, stylesheets and behavior. Functional and object-oriented aspects of JavaScript. Model-view design patterns, templates and frameworks. Client-side technologies for asynchronous events, real-time interaction and access to back-end web services." 
-            CPSC 131,,,CPSC 411,3,Mobile Device Application Programming,"Introduction to developing applications for mobile devices, including but not limited to runtime environments, development tools and debugging tools used in creating applications for mobile devices. Use emulators in lab. Students must provide their own mobile devices." 
-            CPSC 362,,,CPSC 464,3,Software Architecture,"Basic principles and practices of software design and architecture. High-level design, software architecture, documenting software architecture, software and architecture evaluation, software product lines and some considerations beyond software architecture." 
-            CPSC 362,,,CPSC 462,3,Software Design,"Concepts of software modeling, software process and some tools. Object-oriented analysis and design and Unified process. Some computer-aided software engineering (CASE) tools will be recommended to use for doing homework assignments." 
-            CPSC 362,,,CPSC 463,3,Software Testing,"Software testing techniques, reporting problems effectively and planning testing projects. Students apply what they learned throughout the course to a sample application that is either commercially available or under development." 
-            CPSC 362,,,CPSC 466,3,Software Process,"Practical guidance for improving the software development process. How to establish, maintain and improve software processes. Exposure to agile processes, ISO 12207 and CMMI." 
-            CPSC 386,CPSC 484,,CPSC 486,3,Game Programming,"Survey of data structures and algorithms used for real-time rendering and computer game programming. Build upon existing mathematics and programming knowledge to create interactive graphics programs." 
-            CPSC 486,,,CPSC 489,3,Game Development Project,"Individually or in teams, students design, plan and build a computer game." 
-            CPSC 121,,,CPSC 386,3,Introduction to Game Design and Production,"Current and future technologies and market trends in game design and production. Game technologies, basic building tools for games and the process of game design, development and production." 
-            ,,,CPSC 301,2,Programming Lab Practicum ,"Intensive programming covering concepts learned in lower-division courses. Procedural and object oriented design, documentation, arrays, classes, file input/output, recursion, pointers, dynamic variables, data and file structures." 
-            """
-            csv_text = textwrap.dedent(csv_text).strip()  # clean up indentation
+            csv_text = _load_test_electives_csv()
             degree_electives = _parse_degree_electives_csv(csv_text)
             job_id = 1
             job_name = "Web Developer"
             degree_name = "Bachelor of Computer Science"
 
-            from ai_integration.ai_module import (
-                get_recommendations_ai,
-            )  # self-import safe
-
             main_int_ai()  # ensure initialized
-            result = get_recommendations_ai(
-                job_id=job_id,
-                job_name=job_name,
-                degree_name=degree_name,
-                degree_electives=degree_electives,
-            )
             # ---- NEW VALIDATION: ensure Numbers 1..10 are present in the JSON ----
+            # Object form: no encode/decode round trip just to validate the list.
             try:
-                payload = json.loads(result)
+                payload = _get_recommendations_obj(
+                    job_id=job_id,
+                    job_name=job_name,
+                    degree_name=degree_name,
+                    degree_electives=degree_electives,
+                )
             except json.JSONDecodeError as e:
                 logger.error("main_test_ai option 4: invalid JSON result: %s", e)
                 return False
@@ -388,27 +680,26 @@ def main_test_ai(option: int) -> bool:
                 logger.error("main_test_ai option 4: result JSON is not a list")
                 return False
 
-            found_numbers = set()
+            found_mask = 0  # bit n set once Number n has been seen
             for item in payload:
-                if isinstance(item, dict) and "Number" in item:
-                    n = item.get("Number")
-                    if isinstance(n, int):
-                        found_numbers.add(n)
-                    else:
-                        try:
-                            found_numbers.add(int(str(n)))
-                        except Exception:
-                            pass
-
-            required = set(range(1, 11))  # {1..10}
-            missing = sorted(required - found_numbers)
-            if missing:
+                n = item.get("Number") if isinstance(item, dict) else None
+                if n is not None and not isinstance(n, int):
+                    m = _INT_RE.fullmatch(str(n).strip())
+                    n = int(m.group()) if m else None
+                if n is not None and 1 <= n <= 10:
+                    found_mask |= 1 << n
+                    if found_mask == _REQUIRED_NUMBERS_MASK:
+                        break  # every required Number seen; skip the rest
+
+            missing_mask = _REQUIRED_NUMBERS_MASK & ~found_mask
+            if missing_mask:
+                missing = [i for i in range(1, 11) if missing_mask >> i & 1]
                 logger.error("main_test_ai option 4: missing Numbers %s", missing)
                 return False
 
             logger.info(
-                "main_test_ai option 4: found all Numbers 1..10; recommendations JSON length=%s",
-                len(result) if isinstance(result, str) else 0,
+                "main_test_ai option 4: found all Numbers 1..10; recommendations count=%s",
+                len(payload),
             )
             return True
 
@@ -444,15 +735,64 @@ def get_recommendations_ai(
     :rtype: str
     :raises Exception: On file I/O or model invocation errors in real mode.
     """
-    logger.debug(f"Job ID: {job_id}, Job Name: {job_name}, Degree Name: {degree_name}")
+    logger.debug(
+        "Job ID: %s, Job Name: %s, Degree Name: %s", job_id, job_name, degree_name
+    )
 
     ai_enabled = parse_bool_env("AI_ENABLED", default=False)
     if not ai_enabled:
         return fake_chatgpt_response(job_id, job_name, degree_name, degree_electives)
 
-    result = real_chatgpt_response(job_id, job_name, degree_name, degree_electives)
-    # Ensure we always return a string for callers while real path is WIP.
-    return result if isinstance(result, str) else ""
+    return real_chatgpt_response(job_id, job_name, degree_name, degree_electives)
+
+
+def _get_recommendations_obj(
+    job_id: int,
+    job_name: str,
+    degree_name: str,
+    degree_electives: List[Dict[str, Any]],
+) -> Any:
+    """Like :func:`get_recommendations_ai`, but return the parsed payload.
+
+    For in-process callers (the option-4 self-test) that would otherwise
+    decode the JSON string straight back: real mode hands over the course list
+    it just built, and fake mode parses the cached file bytes once.
+
+    :returns: Recommendations (normally a list of course dicts).
+    :raises json.JSONDecodeError: If fake mode's ``courses.json`` is malformed.
+    """
+    ai_enabled = parse_bool_env("AI_ENABLED", default=False)
+    if not ai_enabled:
+        return _loads_json(
+            fake_chatgpt_response_bytes(job_id, job_name, degree_name, degree_electives)
+        )
+
+    courses, _json_data = _real_chatgpt_courses(
+        job_id, job_name, degree_name, degree_electives
+    )
+    return courses
+
+
+def get_recommendations_ai_batch(requests: List[Dict[str, Any]]) -> List[str]:
+    """Generate recommendations for several (job, degree) requests at once.
+
+    In real mode all requests share a single model call: the system prompt is
+    sent once and the reply is split per job on ``===JOB <n>===`` markers
+    (see :func:`real_chatgpt_response_batch`). A single request, or fake mode,
+    goes through :func:`get_recommendations_ai` unchanged.
+
+    :param requests: Dicts with the keyword arguments of
+        :func:`get_recommendations_ai` (``job_id``, ``job_name``,
+        ``degree_name``, ``degree_electives``).
+    :type requests: List[Dict[str, Any]]
+    :returns: One JSON string per request, in request order.
+    :rtype: List[str]
+    :raises Exception: On file I/O or model invocation errors in real mode.
+    """
+    if len(requests) <= 1 or not parse_bool_env("AI_ENABLED", default=False):
+        return [get_recommendations_ai(**r) for r in requests]
+
+    return real_chatgpt_response_batch(requests)
 
 
 # -------------------------------------------------------------------------------
@@ -474,22 +814,44 @@ def fake_chatgpt_response(
     :type degree_name: str
     :param degree_electives: Parsed elective rows (unused in fake mode).
     :type degree_electives: List[Dict[str, Any]]
-    :returns: Pretty-printed JSON string loaded from the local file.
+    :returns: JSON text of the local file, returned verbatim after validation.
     :rtype: str
     :raises FileNotFoundError: If ``courses.json`` cannot be located.
     :raises json.JSONDecodeError: If the JSON file is malformed.
     :raises Exception: For any other unexpected I/O condition.
     """
+    return fake_chatgpt_response_bytes(
+        job_id, job_name, degree_name, degree_electives
+    ).decode("utf-8")
+
+
+def fake_chatgpt_response_bytes(
+    job_id: int,
+    job_name: str,
+    degree_name: str,
+    degree_electives: List[Dict[str, Any]],
+) -> bytes:
+    """Return canned recommendations from ``courses.json`` as raw UTF-8 bytes.
+
+    Same contract as :func:`fake_chatgpt_response`, for callers that write the
+    payload to a file or socket and would otherwise re-encode the string.
+
+    :returns: UTF-8 JSON bytes of the local file (cached by mtime and size).
+    :rtype: bytes
+    :raises FileNotFoundError: If ``courses.json`` cannot be located.
+    :raises json.JSONDecodeError: If the JSON file is malformed.
+    :raises Exception: For any other unexpected I/O condition.
+    """
     logger.warning("[FAKE CHATGPT] Returning canned response...")
     logger.info("AI_ENABLED=False: Loading recommendations from courses.json")
 
-    path = _find_courses_json()
+    path = _find_courses_json_cached()
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        st = os.stat(path)
+        raw = _load_courses_json_bytes(path, st.st_mtime_ns, st.st_size)
         logger.info("Recommendations loaded successfully from courses.json")
-        return json.dumps(data, indent=4)
-    except FileNotFoundError as e:
+        return raw
+    except FileNotFoundError:
         logger.error("courses.json not found at expected locations: %s", path)
         raise
     except json.JSONDecodeError as e:
@@ -500,6 +862,21 @@ def fake_chatgpt_response(
         raise
 
 
+@functools.lru_cache(maxsize=512)
+def _prereq_slots(prerequisites: Optional[str]) -> str:
+    """Render a prerequisites string as the three ``Prereq1,Prereq2,Prereq3`` slots.
+
+    Memoized: the same few prerequisite strings repeat across electives.
+    """
+    # Ensure the prerequisites string yields exactly 3 comma-separated slots for the downstream prompt schema.
+    if not prerequisites or str(prerequisites).strip().lower() == "none":
+        return "None,,"
+    tokens = [t.strip() for t in str(prerequisites).split(",") if t.strip()]
+    while len(tokens) < 3:
+        tokens.append("")
+    return ",".join(tokens[:3])
+
+
 def format_elective_string(prerequisites, course_code, units, name, description):
     """
     Formats a single elective line for the prompt builder.
@@ -514,17 +891,108 @@ def format_elective_string(prerequisites, course_code, units, name, description)
     Returns:
         str: "Prereq1,Prereq2,Prereq3,Course,Units,Name,Description" compatible string (placeholders auto-filled).
     """
-    # Ensure the prerequisites string yields exactly 3 comma-separated slots for the downstream prompt schema.
-    if not prerequisites or str(prerequisites).strip().lower() == "none":
-        p1, p2, p3 = "None", "", ""
-    else:
-        tokens = [t.strip() for t in str(prerequisites).split(",") if t.strip()]
-        while len(tokens) < 3:
-            tokens.append("")
-        p1, p2, p3 = tokens[:3]
+    return _format_electives_str(
+        ((prerequisites, course_code, units, name, description),)
+    )
+
+
+def _format_electives_str(electives_key: Iterable[Tuple[Any, ...]]) -> str:
+    """Render elective rows as newline-separated prompt lines.
+
+    The one place that owns the prompt line layout:
+    :func:`format_elective_string`, :func:`_build_prompt` and the batch prompt
+    all go through it.
+
+    :param electives_key: ``(prerequisites, course_code, units, name,
+        description)`` rows, as produced by :func:`_electives_key`.
+    :returns: One ``Prereq1,Prereq2,Prereq3,Course,Units,Name,Description`` line per row.
+    :rtype: str
+    """
+    return "\n".join(
+        [
+            _ELECTIVE_LINE_FMT(
+                _prereq_slots(prereqs),
+                code,
+                "" if units in (None, "") else units,
+                name,
+                description,
+            )
+            for prereqs, code, units, name, description in electives_key
+        ]
+    )
+
+
+def _strip_status_label(text: str) -> str:
+    """Drop a leading status label such as ``"Need to take:"`` from prerequisites.
+
+    Everything up to and including the first colon is removed; text without a
+    colon is returned stripped.
+    """
+    idx = text.find(":")
+    return text[idx + 1 :].strip() if idx != -1 else text.strip()
 
-    units_text = "" if units in (None, "") else str(units)
-    return f"{p1},{p2},{p3},{course_code},{units_text},{name},{description}"
+
+def _electives_key(
+    degree_electives: List[Dict[str, Any]],
+) -> Tuple[Tuple[Any, ...], ...]:
+    """Hashable snapshot of the elective fields that appear in the prompt."""
+    return tuple(
+        (
+            e["prerequisites"],
+            e["course_code"],
+            e["units"],
+            e["name"],
+            e["description"],
+        )
+        for e in degree_electives
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_prompt(
+    legacy_markdown: bool,
+    job_name: str,
+    degree_name: str,
+    electives_key: Tuple[Tuple[Any, ...], ...],
+) -> Any:
+    """Render the single-job prompt, memoized per input.
+
+    Repeated (job, degree, electives) requests skip the elective formatting and
+    ``ChatPromptTemplate.invoke``; the cache is cleared whenever
+    :func:`main_int_ai` rebuilds the templates.
+
+    :param legacy_markdown: Use the markdown ``prompt_template`` instead of
+        ``json_prompt_template``.
+    :param electives_key: Output of :func:`_electives_key`.
+    :returns: The rendered prompt value passed to the model.
+    """
+    # format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'
+    electives_str = _format_electives_str(electives_key)
+    logger.debug("Formatted electives_str:\n%s", electives_str)
+
+    template = prompt_template if legacy_markdown else json_prompt_template
+    return template.invoke(
+        {
+            "p_career_path": job_name,
+            "p_degree": degree_name,
+            "p_electives": electives_str,
+        }
+    )
+
+
+def _iter_starred_lines(input_text: str) -> Iterator[str]:
+    """Yield the lines :func:`extract_starred_lines` keeps, one at a time."""
+    for line in input_text.split("\n"):
+        stripped_line = line.strip()
+        if "*" in stripped_line:
+            # Check if the line starts with "**Prerequisites:**"
+            if stripped_line.startswith(_PREREQ_PREFIX):
+                # Remove text between "**Prerequisites:**" and the first colon ":"
+                # This will transform "**Prerequisites:** Need to take: CPSC 335, MATH 338" to "**Prerequisites:** CPSC 335, MATH 338"
+                rest = stripped_line[len(_PREREQ_PREFIX) :]
+                if ":" in rest:
+                    stripped_line = f"{_PREREQ_PREFIX} {_strip_status_label(rest)}"
+            yield stripped_line
 
 
 def extract_starred_lines(input_text):
@@ -538,31 +1006,98 @@ def extract_starred_lines(input_text):
     Returns:
         list: A list of lines containing at least one asterisk, with modified prerequisites lines.
     """
-    # Split the input text into individual lines
-    lines = input_text.split("\n")
+    return list(_iter_starred_lines(input_text))
 
-    starred_lines = []
-    for line in lines:
-        stripped_line = line.strip()
-        if "*" in stripped_line:
-            # Check if the line starts with "**Prerequisites:**"
-            if stripped_line.startswith("**Prerequisites:**"):
-                # Use regex to remove text between "**Prerequisites:**" and the first colon ":"
-                # This will transform "**Prerequisites:** Need to take: CPSC 335, MATH 338" to "**Prerequisites:** CPSC 335, MATH 338"
-                modified_line = re.sub(
-                    r"(\*\*Prerequisites:\*\*)[^:]*:\s*", r"\1 ", stripped_line
-                )
-                starred_lines.append(modified_line)
-            else:
-                starred_lines.append(stripped_line)
 
-    return starred_lines
+def _parse_course_markdown(text: str) -> List[Dict[str, Any]]:
+    """Parse a complete markdown reply into course dicts.
+
+    Same result as ``parse_course_data(extract_starred_lines(text))``, but the
+    filtered lines stream straight into the parser's single join instead of
+    being collected into an intermediate list first.
+    """
+    return parse_course_data(_iter_starred_lines(text))
+
+
+def _collect_streamed_reply(chunks: Iterable[Any]) -> Tuple[str, List[str]]:
+    """Consume a streamed chat reply, extracting starred lines as they complete.
+
+    Each line is run through :func:`extract_starred_lines` as soon as its
+    newline arrives, so extraction overlaps token generation instead of
+    waiting for the full reply.
+
+    :param chunks: Message chunks from ``model.stream(...)`` (``.content`` text).
+    :returns: ``(full_text, starred_lines)``.
+    :rtype: Tuple[str, List[str]]
+    """
+    parts: List[str] = []
+    starred_lines: List[str] = []
+    # Pieces of the unfinished line; joined once when its newline arrives
+    # (not `pending += text`, which recopies a long line for every chunk).
+    pending: List[str] = []
+    for chunk in chunks:
+        text = chunk.content
+        if not text:
+            continue
+        parts.append(text)
+        if "\n" in text:
+            head, _, tail = text.rpartition("\n")
+            pending.append(head)
+            starred_lines.extend(_iter_starred_lines("".join(pending)))
+            pending.clear()
+            if tail:
+                pending.append(tail)
+        else:
+            pending.append(text)
+    if pending:
+        starred_lines.extend(_iter_starred_lines("".join(pending)))
+    return "".join(parts), starred_lines
+
+
+def _courses_from_json_reply(content: str) -> List[Dict[str, Any]]:
+    """Read the course list from a JSON-mode model reply.
+
+    Accepts ``{"courses": [...]}`` (what :data:`_JSON_OUTPUT_PROMPT` asks for)
+    or a bare array, and applies the same prerequisites clean-up as
+    :func:`extract_starred_lines`.
+
+    :raises ValueError: If the reply does not contain a list of course objects.
+    :raises json.JSONDecodeError: If the reply is not valid JSON.
+    """
+    data = _loads_json(content)
+    courses = data.get("courses") if isinstance(data, dict) else data
+    if not isinstance(courses, list):
+        raise ValueError("JSON reply has no 'courses' list")
+
+    courses = [c for c in courses if isinstance(c, dict)]
+    for course in courses:
+        prereqs = course.get("Prerequisites")
+        if isinstance(prereqs, str):
+            course["Prerequisites"] = _strip_status_label(prereqs)
+    return courses
+
+
+def _int_or_raw(value: str) -> Union[int, str]:
+    """``int(value)``, or ``value`` unchanged if it is not an integer.
+
+    Checked with :data:`_INT_RE` first, so a non-numeric reply (e.g. a
+    ``Rating`` of ``"High"``) takes a branch instead of a raised ValueError.
+    """
+    return int(value) if _INT_RE.fullmatch(value) else value
+
+
+# Value converters for parse_course_data; keys not listed are stored as text
+_COURSE_VALUE_CONVERTERS: Dict[str, Any] = {"Rating": _int_or_raw}
 
 
 def parse_course_data(starred_lines):
     """
     Parses the array of starred lines and converts them into a list of dictionaries.
 
+    The lines are scanned in one pass with :data:`_COURSE_BLOCK_RE`: each match
+    is a ``**Key:** value`` line plus any following lines that do not start a
+    new key. Continuation lines are kept only for ``Explanation``.
+
     Args:
         starred_lines (list): A list of lines containing course details.
 
@@ -571,72 +1106,116 @@ def parse_course_data(starred_lines):
     """
     courses = []
     course = {}
-    explanation_key = "**Explanation:**"
-    prerequisites_key = "**Prerequisites:**"
-    current_key = None
-    explanation_lines = []
-
-    for line in starred_lines:
-        # Check if the line starts with a key pattern
-        key_match = re.match(r"\*\*(.+?):\*\*\s*(.*)", line)
-        if key_match:
-            key, value = key_match.groups()
-            key = key.strip()
-            value = value.strip()
-
-            if key == "Number":
+    explanation = None  # attached when the course is complete
+
+    for key, block in _COURSE_BLOCK_RE.findall("\n".join(starred_lines)):
+        key = key.strip()
+        value, has_continuation, continuation = block.partition("\n")
+        value = value.strip()
+
+        match key:
+            case "Number":
                 # If there's an existing course being parsed, add it to the list
                 if course:
-                    # If there's any accumulated explanation lines, join them
-                    if explanation_lines:
-                        course["Explanation"] = " ".join(explanation_lines).strip()
-                        explanation_lines = []
+                    if explanation is not None:
+                        course["Explanation"] = explanation
+                        explanation = None
                     courses.append(course)
                     course = {}
-                course["Number"] = int(value)
-                current_key = "Number"
+                number = _int_or_raw(value)
+                if not isinstance(number, int):
+                    logger.warning("Non-numeric course Number kept as text: %r", value)
+                course["Number"] = number
+            case "Explanation":
+                # Multiline field: join continuation lines with spaces, once
+                if has_continuation:
+                    continuation = continuation.replace("\n", " ")
+                    value = f"{value} {continuation}".strip()
+                    course["Explanation"] = value  # same key order as before
+                explanation = value
+            case _:
+                # Plain fields; per-key value conversion is table-driven
+                convert = _COURSE_VALUE_CONVERTERS.get(key)
+                course[key] = convert(value) if convert else value
 
-            elif key == "Course Code":
-                course["Course Code"] = value
-                current_key = "Course Code"
+    # Add the last course after the loop ends
+    if course:
+        if explanation is not None:
+            course["Explanation"] = explanation
+        courses.append(course)
 
-            elif key == "Course Name":
-                course["Course Name"] = value
-                current_key = "Course Name"
+    return courses
 
-            elif key == "Rating":
-                try:
-                    course["Rating"] = int(value)
-                except ValueError:
-                    course["Rating"] = value  # Keep as string if not an integer
-                current_key = "Rating"
 
-            elif key == "Explanation":
-                explanation_lines = [value]
-                current_key = "Explanation"
+def _llm_cache_key(
+    job_name: str, degree_name: str, degree_electives: List[Dict[str, Any]]
+) -> str:
+    """Content hash identifying a real-mode request.
 
-            elif key == "Prerequisites":
-                course["Prerequisites"] = value
-                current_key = "Prerequisites"
+    Covers the prompt text, job, degree and electives, so editing the prompt
+    or the elective list never serves an old reply.
+    """
+    h = hashlib.sha1()
+    for part in (_SYSTEM_PROMPT, _JSON_OUTPUT_PROMPT, _HUMAN_PROMPT):
+        h.update(part.encode("utf-8"))
+    h.update(f"|{job_name}|{degree_name}|".encode("utf-8"))
+    h.update(
+        json.dumps(degree_electives, sort_keys=True, separators=(",", ":")).encode(
+            "utf-8"
+        )
+    )
+    return h.hexdigest()
 
-            else:
-                # Handle any unexpected keys
-                course[key] = value
-                current_key = key
 
-        else:
-            # Handle multiline fields like Explanation
-            if current_key == "Explanation":
-                explanation_lines.append(line)
-                course["Explanation"] = " ".join(explanation_lines).strip()
+def _llm_cache_connect() -> sqlite3.Connection:
+    """Open (creating if needed) the SQLite response cache."""
+    path = os.getenv("AI_CACHE_PATH") or os.path.join(
+        os.getcwd(), *_LLM_CACHE_DEFAULT_RELPATH
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        "key TEXT PRIMARY KEY, json_data TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    return conn
 
-    # Add the last course after the loop ends
-    if course:
-        if explanation_lines:
-            course["Explanation"] = " ".join(explanation_lines).strip()
-        courses.append(course)
 
-    return courses
+def _llm_cache_get(key: str) -> Optional[str]:
+    """Return the cached JSON for ``key`` if present and not expired.
+
+    Cache errors are logged and treated as a miss.
+    """
+    try:
+        conn = _llm_cache_connect()
+        try:
+            row = conn.execute(
+                "SELECT json_data FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, time.time() - _LLM_CACHE_TTL_SECONDS),
+            ).fetchone()
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("LLM response cache read failed: %s", e)
+        return None
+    return row[0] if row else None
+
+
+def _llm_cache_set(key: str, json_data: str) -> None:
+    """Store ``json_data`` under ``key``; failures are logged, not raised."""
+    try:
+        conn = _llm_cache_connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, json_data, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json_data, time.time()),
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("LLM response cache write failed: %s", e)
 
 
 def real_chatgpt_response(
@@ -644,11 +1223,14 @@ def real_chatgpt_response(
     job_name: str,
     degree_name: str,
     degree_electives: List[Dict[str, Any]],
-):
-    """Produce recommendations using a real LLM backend (placeholder).
+) -> str:
+    """Produce recommendations using a real LLM backend.
 
-    This stub logs intent and will be implemented to call a provider such as
-    OpenAI via LangChain/LangGraph.
+    Formats the electives into the prompt built by :func:`main_int_ai` and asks
+    the OpenAI chat model (via LangChain) for a JSON reply in the same schema
+    served by :func:`fake_chatgpt_response`. With ``AI_LEGACY_MARKDOWN=1`` the
+    model instead streams the ``**Key:** value`` markdown reply, which is
+    parsed with :func:`extract_starred_lines` / :func:`parse_course_data`.
 
     :param job_id: Numeric job identifier.
     :type job_id: int
@@ -658,117 +1240,327 @@ def real_chatgpt_response(
     :type degree_name: str
     :param degree_electives: Parsed elective rows to inform prompting.
     :type degree_electives: List[Dict[str, Any]]
-    :returns: Currently ``None`` (to be updated to a JSON string).
-    :rtype: Optional[str]
+    :returns: JSON string representing recommended courses (list of objects).
+    :rtype: str
+    :raises RuntimeError: If the model call fails.
+    """
+    _courses, json_data = _real_chatgpt_courses(
+        job_id, job_name, degree_name, degree_electives
+    )
+    return json_data
+
+
+def _real_chatgpt_courses(
+    job_id: int,
+    job_name: str,
+    degree_name: str,
+    degree_electives: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Run :func:`real_chatgpt_response` and keep the parsed course list.
+
+    :returns: ``(courses, json_data)`` - the parsed recommendations and the
+        JSON text written to ``courses.json``.
+    :raises RuntimeError: If the model call fails (prompt, parsing and file
+        errors propagate unchanged).
     """
     logger.info("AI_ENABLED=True: Invoking AI model for recommendations.")
     logger.debug(
         "Job ID: %s, Job Name: %s, Degree Name: %s", job_id, job_name, degree_name
     )
 
-    # No explicit return -> returns None for now.
+    # Identical requests (same prompt, job, degree, electives) reuse the stored reply
+    cache_key = None
+    if parse_bool_env("AI_CACHE_ENABLED", default=False):
+        cache_key = _llm_cache_key(job_name, degree_name, degree_electives)
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            logger.info("AI response cache hit; skipping model call.")
+            # courses.json must reflect this reply too, as on the uncached path
+            _publish_courses_json(cached.encode("utf-8"))
+            return _loads_json(cached), cached
+
+    # Prepare the prompt with the provided parameters (memoized per input)
+    # JSON mode by default; AI_LEGACY_MARKDOWN=1 keeps the "**Key:** value" reply
+    legacy_markdown = parse_bool_env("AI_LEGACY_MARKDOWN", default=False)
+    prompt = _build_prompt(
+        legacy_markdown, job_name, degree_name, _electives_key(degree_electives)
+    )
 
+    #         """
+    # CPSC 335,MATH 338,,CPSC 483,3,Introduction to Machine Learning,"Design, implement and analyze machine learning algorithms, including supervised learning and unsupervised learning algorithms. Methods to address uncertainty. Projects with real-world data."
+    # CPSC 131,MATH 338,,CPSC 375,3,Introduction to Data Science and Big Data ,"Techniques for data preparation, exploratory analysis, statistical modeling, machine learning and visualization. Methods for analyzing different types of data, such as natural language and time-series, from emerging applications, including Internet-of-Things. Big data platforms. Projects with real-world data."
+    # CPSC 131,,,CPSC 485,3,Computational Bioinformatics,"Algorithmic approaches to biological problems. Specific topics include motif finding, genome rearrangement, DNA sequence comparison, sequence alignment, DNA sequencing, repeat finding and gene expression analysis."
+    # MATH 270B,CPSC 131,,CPSC 452,3,Cryptography,"Introduction to cryptography and steganography. Encryption, cryptographic hashing, certificates, and signatures. Classical, symmetric-key, and public-key ciphers. Block modes of operation. Cryptanalysis including exhaustive search, man-in-the-middle, and birthday attacks. Programing projects involving implementation of cryptographic systems."
+    # CPSC 351, CPSC 353,,CPSC 454,3,Cloud Computing and Security,"Cloud computing and cloud security, distributed computing, computer clusters, grid computing, virtual machines and virtualization, cloud computing platforms and deployment models, cloud programming and software environments, vulnerabilities and risks of cloud computing, cloud infrastructure protection, data privacy and protection."
+    # CPSC 351 or CPSC 353,,,CPSC 455,3,Web Security,"Concepts of web application security. Web security mechanisms, including authentication, access control and protecting sensitive data. Common vulnerabilities, including code and SQL attacks, cross-site scripting and cross-site request forgery. Implement hands-on web application security mechanisms and security testing."
+    # CPSC 351,,,CPSC 474,3,Parallel and Distributed Computing,"Concepts of distributed computing; distributed memory and shared memory architectures; parallel programming techniques; inter-process communication and synchronization; programming for parallel architectures such as multi-core and GPU platforms; project involving distributed application development."
+    # CPSC 351,,,CPSC 479,3,Introduction to High Performance Computing,"Introduction to the concepts of high-performance computing and the paradigms of parallel programming in a high level programming language, design and implementation of parallel algorithms on distributed memory, machine learning techniques on large data sets, implementation of parallel algorithms."
+    # CPSC 121 or MATH 320,MATH 270B or MATH 280,,CPSC 439,3,Theory of Computation,"Introduction to the theory of computation. Automata theory; finite state machines, context free grammars, and Turing machines; hierarchy of formal language classes. Computability theory and undecidable problems. Time complexity; P and NP-complete problems. Applications to software design and security."
+    # MATH 250A ,,,MATH 335,3,Mathematical Probability,"Probability theory; discrete, continuous and multivariate probability distributions, independence, conditional probability distribution, expectation, moment generating functions, functions of random variables and the central limit theorem."
+    # CPSC 131, MATH 150B, MATH 270B,CPSC 484,3,Principles of Computer Graphics,"Examine and analyze computer graphics, software structures, display processor organization, graphical input/output devices, display files. Algorithmic techniques for clipping, windowing, character generation and viewpoint transformation."
+    # ,,,CPSC 499,3,Independent Study,"Special topic in computer science, selected in consultation with and completed under the supervision of instructor. May be repeated for a maximum of 9 units of Undergraduate credit and 6 units of Graduate credit. Requires approval by the Computer Science chair."
+    # CPSC 351,CPSC 353 or CPSC 452,,CPSC 459,3,Blockchain Technologies,"Digital assets as a medium of exchange to secure financial transactions; decentralized and distributed ledgers that record verifiable transactions; smart contracts and Ethereum; Bitcoin mechanics and mining; the cryptocurrency ecosystem; blockchain mechanics and applications."
+    # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 370,3,Mathematical Model Building,"Introduction to mathematical models in science and engineering: dimensional analysis, discrete and continuous dynamical systems, flow and diffusion models."
+    # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 340,,Numerical Analysis,"Approximate numerical solutions of systems of linear and nonlinear equations, interpolation theory, numerical differentiation and integration, numerical solution of ordinary differential equations. Computer coding of numerical methods."
+    # CPSC 351,,,CPSC 456,3,Network Security Fundamentals,"Learn about vulnerabilities of network protocols, attacks targeting confidentiality, integrity and availability of data transmitted across networks, and methods for diagnosing and closing security gaps through hands-on exercises."
+    # CPSC 351,,,CPSC 458,3,Malware Analysis,"Introduction to principles and practices of malware analysis. Topics include static and dynamic code analysis, data decoding, analysis tools, debugging, shellcode analysis, reverse engineering of stealthy malware and written presentation of analysis results."
+    # CPSC 332,,,CPSC 431,3,Database and Applications,"Database design and application development techniques for a real world system. System analysis, requirement specifications, conceptual modeling, logic design, physical design and web interface development. Develop projects using contemporary database management system and web-based application development platform."
+    # CPSC 332,,,CPSC 449,3,Web Back-End Engineering,"Design and architecture of large-scale web applications. Techniques for scalability, session management and load balancing. Dependency injection, application tiers, message queues, web services and REST architecture. Caching and eventual consistency. Data models, partitioning and replication in relational and non-relational databases."
+    # CPSC 240,,,CPSC 440,3,Computer System Architecture,"Computer performance, price/performance, instruction set design and examples. Processor design, pipelining, memory hierarchy design and input/output subsystems."
+    # CPSC 131 ,,,CPSC 349 ,3, Web Front-End Engineering ,"Concepts and architecture of interactive web applications, including markup, stylesheets and behavior. Functional and object-oriented aspects of JavaScript. Model-view design patterns, templates and frameworks. Client-side technologies for asynchronous events, real-time interaction and access to back-end web services."
+    # CPSC 131,,,CPSC 411,3,Mobile Device Application Programming,"Introduction to developing applications for mobile devices, including but not limited to runtime environments, development tools and debugging tools used in creating applications for mobile devices. Use emulators in lab. Students must provide their own mobile devices."
+    # CPSC 362,,,CPSC 464,3,Software Architecture,"Basic principles and practices of software design and architecture. High-level design, software architecture, documenting software architecture, software and architecture evaluation, software product lines and some considerations beyond software architecture."
+    # CPSC 362,,,CPSC 462,3,Software Design,"Concepts of software modeling, software process and some tools. Object-oriented analysis and design and Unified process. Some computer-aided software engineering (CASE) tools will be recommended to use for doing homework assignments."
+    # CPSC 362,,,CPSC 463,3,Software Testing,"Software testing techniques, reporting problems effectively and planning testing projects. Students apply what they learned throughout the course to a sample application that is either commercially available or under development."
+    # CPSC 362,,,CPSC 466,3,Software Process,"Practical guidance for improving the software development process. How to establish, maintain and improve software processes. Exposure to agile processes, ISO 12207 and CMMI."
+    # CPSC 386,CPSC 484,,CPSC 486,3,Game Programming,"Survey of data structures and algorithms used for real-time rendering and computer game programming. Build upon existing mathematics and programming knowledge to create interactive graphics programs."
+    # CPSC 486,,,CPSC 489,3,Game Development Project,"Individually or in teams, students design, plan and build a computer game."
+    # CPSC 121,,,CPSC 386,3,Introduction to Game Design and Production,"Current and future technologies and market trends in game design and production. Game technologies, basic building tools for games and the process of game design, development and production."
+    # ,,,CPSC 301,2,Programming Lab Practicum ,"Intensive programming covering concepts learned in lower-division courses. Procedural and object oriented design, documentation, arrays, classes, file input/output, recursion, pointers, dynamic variables, data and file structures."
+
+    # """,
+    #     }
+    # )
+
+    logger.info("---Working---")
+    # Only the model call is wrapped: prompt, parsing and file errors raise as-is
     try:
-        # Prepare the prompt with the provided parameters
-        # Convert degree_electives to a formatted string
-        # format of: 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'
-        # Format electives_str as 'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'
-        electives_str = "\n".join(
-            [
-                format_elective_string(
-                    e["prerequisites"],
-                    e["course_code"],
-                    e["units"],
-                    e["name"],
-                    e["description"],
-                )
-                for e in degree_electives
-            ]
-        )
-        logger.debug(f"Formatted electives_str:\n{electives_str}")
+        if legacy_markdown:
+            # Stream the reply; lines containing '*' are extracted as they arrive
+            content, starred_lines = _collect_streamed_reply(model.stream(prompt))
+        else:
+            result = model.bind(response_format=_JSON_RESPONSE_FORMAT).invoke(prompt)
+            content = result.content
+    except Exception as e:
+        logger.error("OpenAI model call failed: %s", e)
+        raise RuntimeError("real_chatgpt_response failed") from e
+    logger.info("---DONE---")
+
+    logger.debug("---Raw AI Response---")
+    logger.debug(content)
+    logger.debug("---End Raw AI Response---")
+
+    if legacy_markdown:
+        # Print the resulting array
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("---Lines containing '*': Extracted---")
+            for line in starred_lines:
+                logger.debug(line)
+
+        # Parse the raw data
+        courses = parse_course_data(starred_lines)
+    else:
+        # The reply is already JSON: no markdown parsing needed
+        courses = _courses_from_json_reply(content)
+
+    logger.debug("---Parsed Courses---")
+    logger.debug(courses)
+
+    # Convert the list of courses to JSON (UTF-8 bytes straight from orjson)
+    json_bytes = _dumps_json_bytes(courses)
+    json_data = json_bytes.decode("utf-8")
+
+    # Echo the JSON only when debugging (it was printed to stdout every call)
+    logger.debug("JSON data:\n%s", json_data)
+
+    # After converting to JSON: write the bytes as-is (atomically, only if changed)
+    _publish_courses_json(json_bytes)
+
+    if cache_key is not None:
+        _llm_cache_set(cache_key, json_data)
+
+    return courses, json_data
+
+
+def real_chatgpt_response_batch(requests: List[Dict[str, Any]]) -> List[str]:
+    """Produce recommendations for several jobs with one LLM call.
+
+    Each request becomes a ``===JOB <n>===`` block (career path, degree and
+    electives) in a single human message, numbered by its 1-based position
+    rather than its ``job_id`` so repeated job ids keep separate sections;
+    the model is asked to echo the marker before each job's recommendations,
+    and the reply is split back into per-job JSON strings. Unlike
+    :func:`real_chatgpt_response`, results are not written to
+    ``courses.json``.
+
+    The batched reply is always the ``**Key:** value`` markdown format read
+    by :func:`_parse_course_markdown`: JSON mode is not requested and
+    ``AI_LEGACY_MARKDOWN`` is ignored, because the reply is split on the
+    ``===JOB <n>===`` marker lines.
+
+    :param requests: Dicts with ``job_id``, ``job_name``, ``degree_name`` and
+        ``degree_electives`` keys.
+    :type requests: List[Dict[str, Any]]
+    :returns: One JSON string per request, in request order (``"[]"`` if the
+        model omitted a job).
+    :rtype: List[str]
+    :raises RuntimeError: If prompting, the model call, or parsing fails.
+    """
+    logger.info(
+        "AI_ENABLED=True: Invoking AI model for %d batched requests.", len(requests)
+    )
+
+    try:
+        blocks = [
+            "For each JOB below, output a line '===JOB <id>===' and then that job's "
+            "recommendations in the response format above. "
+            "The electives are in the format of: "
+            "'Prerequisite1,Prerequisite2,Prerequisite3,Course,Units,Name,Description'."
+        ]
+        for i, r in enumerate(requests, start=1):
+            electives_str = _format_electives_str(_electives_key(r["degree_electives"]))
+            blocks.append(
+                f"===JOB {i}===\n"
+                f"Career path: {r['job_name']}\n"
+                f"Degree: {r['degree_name']}\n"
+                f"Electives:\n{electives_str}"
+            )
 
         prompt = prompt_template.invoke(
             {
-                "p_career_path": job_name,
-                "p_degree": degree_name,
-                "p_electives": electives_str,
+                "p_career_path": "the career path named in each JOB block",
+                "p_degree": "the degree named in each JOB block",
+                "p_electives": "\n\n".join(blocks),
             }
         )
 
-        #         """
-        # CPSC 335,MATH 338,,CPSC 483,3,Introduction to Machine Learning,"Design, implement and analyze machine learning algorithms, including supervised learning and unsupervised learning algorithms. Methods to address uncertainty. Projects with real-world data."
-        # CPSC 131,MATH 338,,CPSC 375,3,Introduction to Data Science and Big Data ,"Techniques for data preparation, exploratory analysis, statistical modeling, machine learning and visualization. Methods for analyzing different types of data, such as natural language and time-series, from emerging applications, including Internet-of-Things. Big data platforms. Projects with real-world data."
-        # CPSC 131,,,CPSC 485,3,Computational Bioinformatics,"Algorithmic approaches to biological problems. Specific topics include motif finding, genome rearrangement, DNA sequence comparison, sequence alignment, DNA sequencing, repeat finding and gene expression analysis."
-        # MATH 270B,CPSC 131,,CPSC 452,3,Cryptography,"Introduction to cryptography and steganography. Encryption, cryptographic hashing, certificates, and signatures. Classical, symmetric-key, and public-key ciphers. Block modes of operation. Cryptanalysis including exhaustive search, man-in-the-middle, and birthday attacks. Programing projects involving implementation of cryptographic systems."
-        # CPSC 351, CPSC 353,,CPSC 454,3,Cloud Computing and Security,"Cloud computing and cloud security, distributed computing, computer clusters, grid computing, virtual machines and virtualization, cloud computing platforms and deployment models, cloud programming and software environments, vulnerabilities and risks of cloud computing, cloud infrastructure protection, data privacy and protection."
-        # CPSC 351 or CPSC 353,,,CPSC 455,3,Web Security,"Concepts of web application security. Web security mechanisms, including authentication, access control and protecting sensitive data. Common vulnerabilities, including code and SQL attacks, cross-site scripting and cross-site request forgery. Implement hands-on web application security mechanisms and security testing."
-        # CPSC 351,,,CPSC 474,3,Parallel and Distributed Computing,"Concepts of distributed computing; distributed memory and shared memory architectures; parallel programming techniques; inter-process communication and synchronization; programming for parallel architectures such as multi-core and GPU platforms; project involving distributed application development."
-        # CPSC 351,,,CPSC 479,3,Introduction to High Performance Computing,"Introduction to the concepts of high-performance computing and the paradigms of parallel programming in a high level programming language, design and implementation of parallel algorithms on distributed memory, machine learning techniques on large data sets, implementation of parallel algorithms."
-        # CPSC 121 or MATH 320,MATH 270B or MATH 280,,CPSC 439,3,Theory of Computation,"Introduction to the theory of computation. Automata theory; finite state machines, context free grammars, and Turing machines; hierarchy of formal language classes. Computability theory and undecidable problems. Time complexity; P and NP-complete problems. Applications to software design and security."
-        # MATH 250A ,,,MATH 335,3,Mathematical Probability,"Probability theory; discrete, continuous and multivariate probability distributions, independence, conditional probability distribution, expectation, moment generating functions, functions of random variables and the central limit theorem."
-        # CPSC 131, MATH 150B, MATH 270B,CPSC 484,3,Principles of Computer Graphics,"Examine and analyze computer graphics, software structures, display processor organization, graphical input/output devices, display files. Algorithmic techniques for clipping, windowing, character generation and viewpoint transformation."
-        # ,,,CPSC 499,3,Independent Study,"Special topic in computer science, selected in consultation with and completed under the supervision of instructor. May be repeated for a maximum of 9 units of Undergraduate credit and 6 units of Graduate credit. Requires approval by the Computer Science chair."
-        # CPSC 351,CPSC 353 or CPSC 452,,CPSC 459,3,Blockchain Technologies,"Digital assets as a medium of exchange to secure financial transactions; decentralized and distributed ledgers that record verifiable transactions; smart contracts and Ethereum; Bitcoin mechanics and mining; the cryptocurrency ecosystem; blockchain mechanics and applications."
-        # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 370,3,Mathematical Model Building,"Introduction to mathematical models in science and engineering: dimensional analysis, discrete and continuous dynamical systems, flow and diffusion models."
-        # MATH 250B,MATH 320,CPSC 120 or CPSC 121,MATH 340,,Numerical Analysis,"Approximate numerical solutions of systems of linear and nonlinear equations, interpolation theory, numerical differentiation and integration, numerical solution of ordinary differential equations. Computer coding of numerical methods."
-        # CPSC 351,,,CPSC 456,3,Network Security Fundamentals,"Learn about vulnerabilities of network protocols, attacks targeting confidentiality, integrity and availability of data transmitted across networks, and methods for diagnosing and closing security gaps through hands-on exercises."
-        # CPSC 351,,,CPSC 458,3,Malware Analysis,"Introduction to principles and practices of malware analysis. Topics include static and dynamic code analysis, data decoding, analysis tools, debugging, shellcode analysis, reverse engineering of stealthy malware and written presentation of analysis results."
-        # CPSC 332,,,CPSC 431,3,Database and Applications,"Database design and application development techniques for a real world system. System analysis, requirement specifications, conceptual modeling, logic design, physical design and web interface development. Develop projects using contemporary database management system and web-based application development platform."
-        # CPSC 332,,,CPSC 449,3,Web Back-End Engineering,"Design and architecture of large-scale web applications. Techniques for scalability, session management and load balancing. Dependency injection, application tiers, message queues, web services and REST architecture. Caching and eventual consistency. Data models, partitioning and replication in relational and non-relational databases."
-        # CPSC 240,,,CPSC 440,3,Computer System Architecture,"Computer performance, price/performance, instruction set design and examples. Processor design, pipelining, memory hierarchy design and input/output subsystems."
-        # CPSC 131 ,,,CPSC 349 ,3, Web Front-End Engineering ,"Concepts and architecture of interactive web applications, including markup, stylesheets and behavior. Functional and object-oriented aspects of JavaScript. Model-view design patterns, templates and frameworks. Client-side technologies for asynchronous events, real-time interaction and access to back-end web services."
-        # CPSC 131,,,CPSC 411,3,Mobile Device Application Programming,"Introduction to developing applications for mobile devices, including but not limited to runtime environments, development tools and debugging tools used in creating applications for mobile devices. Use emulators in lab. Students must provide their own mobile devices."
-        # CPSC 362,,,CPSC 464,3,Software Architecture,"Basic principles and practices of software design and architecture. High-level design, software architecture, documenting software architecture, software and architecture evaluation, software product lines and some considerations beyond software architecture."
-        # CPSC 362,,,CPSC 462,3,Software Design,"Concepts of software modeling, software process and some tools. Object-oriented analysis and design and Unified process. Some computer-aided software engineering (CASE) tools will be recommended to use for doing homework assignments."
-        # CPSC 362,,,CPSC 463,3,Software Testing,"Software testing techniques, reporting problems effectively and planning testing projects. Students apply what they learned throughout the course to a sample application that is either commercially available or under development."
-        # CPSC 362,,,CPSC 466,3,Software Process,"Practical guidance for improving the software development process. How to establish, maintain and improve software processes. Exposure to agile processes, ISO 12207 and CMMI."
-        # CPSC 386,CPSC 484,,CPSC 486,3,Game Programming,"Survey of data structures and algorithms used for real-time rendering and computer game programming. Build upon existing mathematics and programming knowledge to create interactive graphics programs."
-        # CPSC 486,,,CPSC 489,3,Game Development Project,"Individually or in teams, students design, plan and build a computer game."
-        # CPSC 121,,,CPSC 386,3,Introduction to Game Design and Production,"Current and future technologies and market trends in game design and production. Game technologies, basic building tools for games and the process of game design, development and production."
-        # ,,,CPSC 301,2,Programming Lab Practicum ,"Intensive programming covering concepts learned in lower-division courses. Procedural and object oriented design, documentation, arrays, classes, file input/output, recursion, pointers, dynamic variables, data and file structures."
-
-        # """,
-        #     }
-        # )
-
         logger.info("---Working---")
         result = model.invoke(prompt)
         logger.info("---DONE---")
+        logger.debug("---Raw AI Response---\n%s", result.content)
+
+        # split() yields [preamble, n1, body1, n2, body2, ...]
+        parts = _BATCH_JOB_RE.split(result.content)
+        sections = dict(zip(parts[1::2], parts[2::2]))
+
+        json_results = []
+        for i, r in enumerate(requests, start=1):
+            body = sections.get(str(i))
+            if body is None:
+                logger.warning(
+                    "Batched AI reply has no section for JOB %d (job_id %s)",
+                    i,
+                    r["job_id"],
+                )
+                json_results.append("[]")
+                continue
+            courses = _parse_course_markdown(body)
+            json_results.append(_dumps_json(courses))
+        return json_results
 
-        logger.debug("---Raw AI Response---")
-        logger.debug(result.content)
-        logger.debug("---End Raw AI Response---")
+    except Exception as e:
+        logger.error("Error during batched OpenAI agent execution: %s", e)
+        raise RuntimeError("real_chatgpt_response_batch failed") from e
 
-        # Extract lines containing '*'
-        starred_lines = extract_starred_lines(result.content)
 
-        # Print the resulting array
-        logger.debug("---Lines containing '*': Extracted---")
-        for idx, line in enumerate(starred_lines, start=1):
-            logger.debug(line)
+# ----------------------------- ASYNC API ---------------------------------------
 
-        # Parse the raw data
-        courses = parse_course_data(starred_lines)
 
-        logger.debug("---Parsed Courses---")
-        logger.debug(courses)
+def _is_transient_ai_error(exc: BaseException) -> bool:
+    """Return whether an LLM call failure is worth retrying (429, 5xx, network)."""
+    import openai  # Local import: only needed once a call has failed
 
-        # Convert the list of courses to JSON
-        json_data = json.dumps(courses, indent=4)
+    return isinstance(
+        exc,
+        (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError),
+    )
 
-        # Print the JSON data
-        print("Print the JSON data:")
-        print(json_data)
 
-        # After converting to JSON
-        with open("courses.json", "w", encoding="utf-8") as json_file:
-            json_file.write(json_data)
-            logger.info("AI recommendations written to courses.json")
+async def _ainvoke_model_once(prompt: Any, json_mode: bool) -> Any:
+    """Invoke the chat model once; ``json_mode`` binds the JSON response format."""
+    runnable = model.bind(response_format=_JSON_RESPONSE_FORMAT) if json_mode else model
+    return await runnable.ainvoke(prompt)
 
-        return json_data
 
-    except Exception as e:
-        logger.error(
-            f"Error during Prompt with System and Human Messages (Tuple):OpenAI agent execution: {e}"
+@functools.lru_cache(maxsize=1)
+def _retrying_ainvoke_model() -> Any:
+    """Wrap :func:`_ainvoke_model_once` with tenacity retries, built on first use.
+
+    tenacity is imported here rather than at module import, like ``openai`` in
+    :func:`_is_transient_ai_error`, so importing this module stays cheap.
+    """
+    from tenacity import (
+        retry,
+        retry_if_exception,
+        stop_after_attempt,
+        wait_exponential,
+    )
+
+    return retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        retry=retry_if_exception(_is_transient_ai_error),
+        reraise=True,
+    )(_ainvoke_model_once)
+
+
+async def _ainvoke_model(prompt: Any, json_mode: bool) -> Any:
+    """Invoke the chat model asynchronously, retrying transient API errors."""
+    return await _retrying_ainvoke_model()(prompt, json_mode)
+
+
+async def aget_recommendations_ai(
+    job_id: int,
+    job_name: str,
+    degree_name: str,
+    degree_electives: List[Dict[str, Any]],
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> str:
+    """Async variant of :func:`get_recommendations_ai` for concurrent requests.
+
+    In real mode the model is called with ``ainvoke`` while holding
+    ``semaphore`` (if given), so concurrent callers stay under the provider's
+    rate limits; 429/5xx/connection errors are retried with exponential
+    backoff. Like the sync path it asks for a JSON reply unless
+    ``AI_LEGACY_MARKDOWN=1`` selects the markdown prompt. Results are not
+    written to ``courses.json``.
+
+    :param semaphore: Optional limiter shared by concurrent calls.
+    :type semaphore: Optional[asyncio.Semaphore]
+    :returns: JSON string representing recommended courses (list of objects).
+    :rtype: str
+    :raises RuntimeError: If prompting, the model call, or parsing fails.
+    """
+    if not parse_bool_env("AI_ENABLED", default=False):
+        return fake_chatgpt_response(job_id, job_name, degree_name, degree_electives)
+
+    logger.info("AI_ENABLED=True: Invoking AI model asynchronously for job %s.", job_id)
+    try:
+        # Same mode switch as _real_chatgpt_courses: JSON unless AI_LEGACY_MARKDOWN=1
+        legacy_markdown = parse_bool_env("AI_LEGACY_MARKDOWN", default=False)
+        prompt = _build_prompt(
+            legacy_markdown, job_name, degree_name, _electives_key(degree_electives)
         )
-        raise RuntimeError("real_chatgpt_response failed") from e
+        if semaphore is None:
+            result = await _ainvoke_model(prompt, not legacy_markdown)
+        else:
+            async with semaphore:
+                result = await _ainvoke_model(prompt, not legacy_markdown)
+
+        if legacy_markdown:
+            courses = _parse_course_markdown(result.content)
+        else:
+            courses = _courses_from_json_reply(result.content)
+        return _dumps_json(courses)
+
+    except Exception as e:
+        logger.error("Error during async OpenAI agent execution: %s", e)
+        raise RuntimeError("aget_recommendations_ai failed") from e
+
+
+async def gather_recommendations(items: List[Dict[str, Any]]) -> List[str]:
+    """Run :func:`aget_recommendations_ai` for many requests concurrently.
+
+    At most ``AI_CONCURRENCY`` (default 8) model calls are in flight at once.
+
+    :param items: Dicts with the keyword arguments of
+        :func:`get_recommendations_ai`.
+    :type items: List[Dict[str, Any]]
+    :returns: One JSON string per item, in item order.
+    :rtype: List[str]
+    """
+    # Created per run: a semaphore is bound to the event loop that first uses it.
+    semaphore = asyncio.Semaphore(int(os.getenv("AI_CONCURRENCY", "8")))
+    return await asyncio.gather(
+        *(aget_recommendations_ai(**item, semaphore=semaphore) for item in items)
+    )
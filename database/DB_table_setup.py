@@ -1,15 +1,28 @@
 
 import sqlite3
 
+from database._conn import get_conn
 
-#this line of code create a connection in sqlite3
-#ai_advice.db
+
+#shared connection to db/ai_advice.db (opened once, reused by the other setup scripts)
+conn = None
 try:
-    conn = sqlite3.connect("db/ai_advice.db")
+    conn = get_conn()
     cursor = conn.cursor()
 
-    #user table 
-    cursor.execute("""
+    # WAL + synchronous=NORMAL: fewer fsyncs; temp tables/indexes stay in memory
+    cursor.executescript("""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA foreign_keys=ON;
+    """)
+
+    # All tables in one transaction (one commit) instead of one implicit commit per CREATE
+    cursor.executescript("""
+    BEGIN IMMEDIATE;
+
+    --user table
     CREATE TABLE IF NOT EXISTS users (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         first_name TEXT NOT NULL,
@@ -18,11 +31,9 @@ try:
         phone TEXT,
         specialization TEXT,
         password_hash TEXT NOT NULL
-    )
-    """)
+    );
 
-    #elective table
-    cursor.execute("""
+    --elective table
     CREATE TABLE IF NOT EXISTS electives (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         course_code TEXT NOT NULL,
@@ -31,11 +42,9 @@ try:
         credits INTEGER NOT NULL,
         description TEXT,
         prerequisites TEXT
-        )
-    """)
+        );
 
-    # recommendations table
-    cursor.execute("""
+    -- recommendations table
     CREATE TABLE IF NOT EXISTS recommendations (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         user_id INTEGER NOT NULL,
@@ -46,11 +55,9 @@ try:
         explanation TEXT,
         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
         FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    """)
+        );
 
-    #feedback table
-    cursor.execute("""
+    --feedback table
     CREATE TABLE IF NOT EXISTS feedback (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         elective_id INTEGER NOT NULL,
@@ -60,14 +67,20 @@ try:
         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
         FOREIGN KEY (elective_id) REFERENCES electives(id),
         FOREIGN KEY (user_id) REFERENCES users(id)
-        )
+        );
+
+    --lookup indexes (users.email already has its UNIQUE index)
+    CREATE INDEX IF NOT EXISTS idx_electives_code ON electives(course_code);
+    CREATE INDEX IF NOT EXISTS idx_recommendations_user ON recommendations(user_id);
+    CREATE INDEX IF NOT EXISTS idx_feedback_elective ON feedback(elective_id);
+    CREATE INDEX IF NOT EXISTS idx_feedback_user ON feedback(user_id);
+
+    COMMIT;
     """)
-    conn.commit()
     print("Tables created successfully.")
 
 except sqlite3.Error as e:
+    #a failed statement leaves BEGIN IMMEDIATE open on the shared connection
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
     print(f"SQLite error: {e}")
-
-finally:
-    if conn:
-        conn.close()
@@ -0,0 +1,16 @@
+#_conn.py
+#shared sqlite3 connection for the setup scripts so they don't each open (and close) their own
+
+import sqlite3
+
+from database.db_setup import get_connection
+
+
+#one connection per db file for the whole process (db/ai_advice.db by default)
+def get_conn(db_path=None):
+    conn = get_connection(db_path)
+    #get_connection returns None when it can't open/configure the file
+    if conn is None:
+        raise sqlite3.Error(f"Could not open database {db_path or 'db/ai_advice.db'}")
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
@@ -3,23 +3,52 @@
 #this file will contain way for the user and system to add infonmation or update the infomation
 
 import sqlite3
+from contextlib import contextmanager
+
+#one connection + one transaction for many adds:
+#   with db_session() as conn:
+#       add_user(..., conn=conn)
+#       add_elective(..., conn=conn)
+#commits when the block ends, rolls back if it raises
+@contextmanager
+def db_session(db_path="db/ai_advice.db"):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+#the add_* functions open (and close) their own connection unless given conn;
+#with conn they leave the commit to the caller
 
 #add user (Register)
-def add_user(first_name, last_name, email, phone, specialization, password_hash):
-    conn = sqlite3.connect("db/ai_advice.db")
+def add_user(first_name, last_name, email, phone, specialization, password_hash, conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect("db/ai_advice.db")
     cursor = conn.cursor()
     cursor.execute("""
         INSERT INTO users (first_name, last_name, email, phone, specialization, password_hash)
         VALUES (?, ?, ?, ?, ?, ?)
     """, (first_name, last_name, email, phone, specialization, password_hash))
-    conn.commit()
     user_id = cursor.lastrowid
-    conn.close()
+    if own_conn:
+        conn.commit()
+        conn.close()
     return user_id
 
 #add a new elective
-def add_elective(course_code, course_title, category_id, credits, description, prerequisites, db_path="ai_advice.db"):
-    conn = sqlite3.connect(db_path)
+def add_elective(course_code, course_title, category_id, credits, description, prerequisites, db_path="ai_advice.db", conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -27,15 +56,18 @@ def add_elective(course_code, course_title, category_id, credits, description, p
         VALUES (?, ?, ?, ?, ?, ?)
     """, (course_code, course_title, category_id, credits, description, prerequisites))
 
-    conn.commit()
     elective_id = cursor.lastrowid
-    conn.close()
+    if own_conn:
+        conn.commit()
+        conn.close()
     return elective_id
 
 #add feedback
-def add_feedback(user_id, elective_id, comment, rating, db_path="ai_advice.db"):
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON")
+def add_feedback(user_id, elective_id, comment, rating, db_path="ai_advice.db", conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
     cursor = conn.cursor()
 
     try:
@@ -43,14 +75,16 @@ def add_feedback(user_id, elective_id, comment, rating, db_path="ai_advice.db"):
             INSERT INTO feedback (user_id, elective_id, comment, rating)
             VALUES (?, ?, ?, ?)
         """, (user_id, elective_id, comment, rating))
-        conn.commit()
+        if own_conn:
+            conn.commit()
         feedback_id = cursor.lastrowid
         return feedback_id
     except sqlite3.Error as e:
         print(f"Error adding feedback: {e}")
         return None
     finally:
-        conn.close()
+        if own_conn:
+            conn.close()
 
 #Test usage
 if __name__ == "__main__":
@@ -1,25 +1,49 @@
-import sqlite3
 import csv
+import sys
+from pathlib import Path
 
-#db connection 
-conn = sqlite3.connect("ai_advice.db")
-cursor = conn.cursor()
-
-#read and openn file 
-with open(r"C:\Users\alexa\Desktop\490\class_elective_advisor_491\database\courses.csv", newline='', encoding='utf-8') as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
-        cursor.execute("""
-        INSERT INTO electives (category, credits, title, description, prerequisites)
-        VALUES (?, ?, ?, ?, ?)
-        """, (
-            row['category(id)'],
-            int(row['credits']),
-            row['title'],
-            row['description'],
-            row['prerequisites']
-        ))
-
-conn.commit()
-conn.close()
-print("Electives imported successfully.")
\ No newline at end of file
+from database._conn import get_conn
+from database.db_setup import _split_course_name
+
+#courses.csv next to this script (was a hard-coded C:\Users\... path)
+DEFAULT_CSV_PATH = Path(__file__).resolve().parent / "courses.csv"
+
+
+def import_electives(db_path=None, csv_path=DEFAULT_CSV_PATH):
+    #db connection (same shared connection / db file DB_table_setup created the tables in)
+    conn = get_conn(db_path)
+    cursor = conn.cursor()
+
+    #courses.csv columns: course_id, subcategory_id, name, description, prerequisites
+    #'name' is "CPSC 120, Introduction to Programming, (3)" -> code, title, credits
+    #(same split as db_setup.populate_courses_data, 3 credits when missing)
+    rows = []
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            course_code, course_title, units = _split_course_name(row['name'].strip())
+            category_id = row['subcategory_id'].strip()
+            if not (course_code and course_title and category_id.isdigit()):
+                continue
+            rows.append((
+                course_code,
+                course_title,
+                int(category_id),
+                int(units) if units and units.isdigit() else 3,
+                row['description'].strip(),
+                row['prerequisites'].strip()
+            ))
+
+    #read the whole file first, then one executemany in one transaction
+    cursor.executemany("""
+    INSERT INTO electives (course_code, course_title, category_id, credits, description, prerequisites)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+    return len(rows)
+
+
+#run as: python -m database.db_elective_set_up [path/to/courses.csv]
+if __name__ == "__main__":
+    import_electives(csv_path=sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH)
+    print("Electives imported successfully.")
@@ -21,7 +21,7 @@ def connect_db():
     try:
         conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row  # This allows accessing columns by name
-        logger.debug(f"Connected to database at {db_path}.")
+        logger.debug("Connected to database at %s.", db_path)
         return conn
     except sqlite3.Error as e:
         logger.error(f"Database connection failed: {e}")
@@ -145,7 +145,7 @@ def get_jobs_by_degree(degree_id):
                     "description": row["description"],
                 }
             )
-        logger.info(f"Fetched {len(jobs)} jobs for degree_id {degree_id}.")
+        logger.info("Fetched %d jobs for degree_id %s.", len(jobs), degree_id)
         return jobs
 
     except sqlite3.Error as e:
@@ -182,7 +182,7 @@ def update_user_preferences(user_id, student_id=None, gpa=None):
                 """,
                 (student_id, user_id),
             )
-            logger.info(f"Updated student_id for user_id: {user_id} to {student_id}")
+            logger.info("Updated student_id for user_id: %s to %s", user_id, student_id)
 
         # Update gpa if provided
         if gpa is not None:
@@ -194,7 +194,7 @@ def update_user_preferences(user_id, student_id=None, gpa=None):
                 """,
                 (gpa, user_id),
             )
-            logger.info(f"Updated gpa for user_id: {user_id} to {gpa}")
+            logger.info("Updated gpa for user_id: %s to %s", user_id, gpa)
 
         conn.commit()
         return True
@@ -264,7 +264,7 @@ def save_user_preferences(user_id, preferences):
                     user_id,
                 ),
             )
-            logger.info(f"Updated preferences for user_id {user_id}.")
+            logger.info("Updated preferences for user_id %s.", user_id)
         else:
             # Insert new preferences
             cursor.execute(
@@ -281,7 +281,7 @@ def save_user_preferences(user_id, preferences):
                     preferences.get("job_id"),
                 ),
             )
-            logger.info(f"Inserted preferences for user_id {user_id}.")
+            logger.info("Inserted preferences for user_id %s.", user_id)
 
         conn.commit()
         conn.close()
@@ -504,7 +504,7 @@ def get_recommendations(user_id, job_id):
         cursor.execute("SELECT * FROM Recommendations")
         all_records = cursor.fetchall()
         record_count = len(all_records)
-        logger.info(f"Total records in Recommendations table: {record_count}")
+        logger.info("Total records in Recommendations table: %s", record_count)
 
         #  Debug Fetch all records with the specified user_id and job_id
         cursor.execute(
@@ -708,7 +708,7 @@ def get_degree_electives(degree_id):
                     "prerequisites": row["prerequisites"],
                 }
             )
-        logger.info(f"Fetched {len(electives)} electives for degree_id {degree_id}.")
+        logger.info("Fetched %d electives for degree_id %s.", len(electives), degree_id)
         return electives
 
     except sqlite3.Error as e:
@@ -1,9 +1,13 @@
 # database/db_ setup.py
+import atexit
 import csv
+import itertools
 import logging
 import os
+import re
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -13,309 +17,361 @@ logger = logging.getLogger(__name__)
 DB_DIRNAME = "db"  # Added Code
 DB_FILENAME = "ai_advice.db"  # Added Code
 
+# Directory holding this module and the reference CSVs (resolved once)
+_SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Max rows per executemany call when bulk-loading the reference CSVs.
+# The CSVs are parsed in Python rather than through SQLite's csv virtual
+# table: the stdlib sqlite3 build ships no csv module (and may lack
+# enable_load_extension), and at a few hundred rows per file the parse
+# is not where load time goes.
+INSERT_BATCH_SIZE = 10_000
+
+# PRAGMA user_version stamped once the reference data has been loaded;
+# bump it to force a reload of the CSVs on existing databases
+REFERENCE_DATA_VERSION = 1
+
+# Full schema, run by create_tables as one script inside one transaction
+_SCHEMA_SQL = """
+    BEGIN;
+
+    -- Existing metadata table (kept as-is for your tests / infra).
+    -- Only main_test_db option 3 writes to it, on a throwaway temp DB;
+    -- the app and the populate path never touch it.
+    CREATE TABLE IF NOT EXISTS metadata (
+        k TEXT PRIMARY KEY,
+        v TEXT
+    );
+
+    -- Normalized academic structure
+    -- Colleges
+    CREATE TABLE IF NOT EXISTS Colleges (
+        college_id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    );
+
+    -- Departments
+    CREATE TABLE IF NOT EXISTS Departments (
+        department_id INTEGER PRIMARY KEY,
+        college_id INTEGER,
+        name TEXT NOT NULL,
+        FOREIGN KEY (college_id)
+            REFERENCES Colleges(college_id)
+            ON DELETE CASCADE
+    );
+
+    -- Degree levels (e.g. Undergraduate, Graduate)
+    CREATE TABLE IF NOT EXISTS Degree_Levels (
+        degree_level_id INTEGER PRIMARY KEY,
+        department_id INTEGER,
+        name TEXT NOT NULL,
+        FOREIGN KEY (department_id)
+            REFERENCES Departments(department_id)
+            ON DELETE CASCADE
+    );
+
+    -- Degrees (e.g. B.S. Computer Science)
+    CREATE TABLE IF NOT EXISTS Degrees (
+        degree_id INTEGER PRIMARY KEY,
+        degree_level_id INTEGER,
+        name TEXT NOT NULL,
+        FOREIGN KEY (degree_level_id)
+            REFERENCES Degree_Levels(degree_level_id)
+            ON DELETE CASCADE
+    );
+
+    -- Requirements (e.g. "Major Requirements", "Support Courses")
+    CREATE TABLE IF NOT EXISTS Requirements (
+        requirement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        degree_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        name TEXT NOT NULL,
+        FOREIGN KEY (degree_id)
+            REFERENCES Degrees(degree_id)
+            ON DELETE CASCADE
+    );
+
+    -- Subcategories (e.g. Lower-Division Core, Upper-Division Core, etc.)
+    CREATE TABLE IF NOT EXISTS Subcategories (
+        subcategory_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        requirement_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        FOREIGN KEY (requirement_id)
+            REFERENCES Requirements(requirement_id)
+            ON DELETE CASCADE
+    );
+
+    -- NOTE from your comment (these are logical examples / seeds, not DDL):
+    -- 1,1,Lower-Division Core
+    -- 2,1,Upper-Division Core
+    -- 3,1,Mathematics Requirements
+    -- 4,1,Science and Mathematics Electives
+    -- 5,1,Computer Science Electives
+    -- Courses table keyed by subcategory (normalized over your old electives)
+    CREATE TABLE IF NOT EXISTS Courses (
+        course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        subcategory_id INTEGER NOT NULL,
+        -- UNIQUE gives course_code its own B-tree index (lookups by code)
+        course_code TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        units INTEGER NOT NULL DEFAULT 3,
+        description TEXT,
+        prerequisites TEXT,
+        FOREIGN KEY (subcategory_id)
+            REFERENCES Subcategories(subcategory_id)
+            ON DELETE CASCADE
+    );
+
+    -- Jobs table (target careers, tied to a degree)
+    CREATE TABLE IF NOT EXISTS Jobs (
+        job_id INTEGER PRIMARY KEY,
+        degree_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        description TEXT,
+        FOREIGN KEY (degree_id)
+            REFERENCES Degrees(degree_id)
+            ON DELETE CASCADE
+    );
+
+    -- Existing app tables that your GUI/tests already use
+    -- users table (kept in lowercase and with the same columns so
+    -- registration/login/tests keep working)
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        phone TEXT,
+        specialization TEXT,
+        password_hash TEXT NOT NULL
+    );
+
+    -- electives table (legacy table your tests and db_add.py use)
+    CREATE TABLE IF NOT EXISTS electives (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_code TEXT NOT NULL,
+        course_title TEXT NOT NULL,
+        category_id INTEGER NOT NULL,
+        credits INTEGER NOT NULL,
+        description TEXT,
+        prerequisites TEXT
+    );
+
+    -- feedback table (legacy feedback used by your tests)
+    CREATE TABLE IF NOT EXISTS feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        elective_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        comment TEXT NOT NULL,
+        rating REAL CHECK(rating >= 0.0 AND rating <= 5.0),
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (elective_id)
+            REFERENCES electives(id),
+        FOREIGN KEY (user_id)
+            REFERENCES users(id)
+    );
+
+    -- New normalized tables that hook into existing users/courses/jobs
+    -- Prerequisites table referencing course_id instead of course_code
+    CREATE TABLE IF NOT EXISTS Prerequisites (
+        prerequisite_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_id INTEGER NOT NULL,
+        prerequisite_course_id INTEGER NOT NULL,
+        FOREIGN KEY (course_id)
+            REFERENCES Courses(course_id)
+            ON DELETE CASCADE,
+        FOREIGN KEY (prerequisite_course_id)
+            REFERENCES Courses(course_id)
+            ON DELETE CASCADE
+    );
+
+    -- User_Preferences table – ties a user to their academic trajectory
+    -- NOTE: FK now points to existing users(id) instead of a new Users table.
+    CREATE TABLE IF NOT EXISTS User_Preferences (
+        preference_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        college_id INTEGER,
+        department_id INTEGER,
+        degree_level_id INTEGER,
+        degree_id INTEGER,
+        job_id INTEGER,
+        FOREIGN KEY (user_id)
+            REFERENCES users(id)
+            ON DELETE CASCADE,
+        FOREIGN KEY (college_id)
+            REFERENCES Colleges(college_id),
+        FOREIGN KEY (department_id)
+            REFERENCES Departments(department_id),
+        FOREIGN KEY (degree_level_id)
+            REFERENCES Degree_Levels(degree_level_id),
+        FOREIGN KEY (degree_id)
+            REFERENCES Degrees(degree_id),
+        FOREIGN KEY (job_id)
+            REFERENCES Jobs(job_id)
+            ON DELETE SET NULL
+    );
+
+    -- FK lookup indexes: cascades from users/Degrees/Jobs probe instead of scanning
+    CREATE INDEX IF NOT EXISTS idx_user_preferences_user ON User_Preferences(user_id);
+    CREATE INDEX IF NOT EXISTS idx_user_preferences_degree ON User_Preferences(degree_id);
+    CREATE INDEX IF NOT EXISTS idx_user_preferences_job ON User_Preferences(job_id);
+
+    -- Recommendations table – redesigned to attach recommendations
+    -- to users, jobs, and normalized Courses.
+    CREATE TABLE IF NOT EXISTS recommendations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        job_id INTEGER,
+        course_id INTEGER,
+        rating REAL NOT NULL,
+        explanation TEXT NOT NULL,
+        rank INTEGER,
+        generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id)
+            REFERENCES users(id)
+            ON DELETE CASCADE,
+        FOREIGN KEY (job_id)
+            REFERENCES Jobs(job_id)
+            ON DELETE CASCADE,
+        FOREIGN KEY (course_id)
+            REFERENCES Courses(course_id)
+            ON DELETE CASCADE
+    );
+
+    -- recommendations indexes are created by create_tables after the script
+    -- (see _RECOMMENDATIONS_INDEXES)
+
+    -- User_Interactions – audit trail for what the user did
+    CREATE TABLE IF NOT EXISTS User_Interactions (
+        interaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        action TEXT NOT NULL,
+        details TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id)
+            REFERENCES users(id)
+            ON DELETE CASCADE
+    );
+
+    COMMIT;
+"""
+
+
+# recommendations indexes, kept out of _SCHEMA_SQL: DB_table_setup.py creates an
+# older recommendations table (no rank/job_id/course_id) in the same db file,
+# and CREATE TABLE IF NOT EXISTS leaves it as is. An index on a missing column
+# would abort the whole schema script, so each one is created only if its
+# columns exist. (user_id, rank) serves both the user FK and "top-K per user".
+_RECOMMENDATIONS_INDEXES = (
+    ("idx_recommendations_user_rank", ("user_id", "rank")),
+    ("idx_recommendations_job", ("job_id",)),
+    ("idx_recommendations_course", ("course_id",)),
+)
+
+
+def create_connection(
+    db_file, check_same_thread: bool = True, bulk_load: bool = False
+) -> Optional["sqlite3.Connection"]:
+    """
+    Create a database connection to the SQLite database specified by db_file.
 
-def create_connection(db_file) -> Optional["sqlite3.Connection"]:
-    """Create a database connection to the SQLite database specified by db_file."""
-    conn = None
+    bulk_load=True also takes an exclusive lock for the connection's lifetime
+    (no shared-memory WAL index, no per-transaction lock traffic); use it only
+    for one-shot setup connections that are closed right after, such as
+    main_int_db's. It fails with "database is locked" while another
+    connection has the file open.
+    """
     try:
-        conn = sqlite3.connect(db_file)
-        logger.info("Connected to SQLite database: %s", db_file)
-        return conn
+        conn = sqlite3.connect(
+            db_file, cached_statements=256, check_same_thread=check_same_thread
+        )
     except sqlite3.Error as e:
         logger.error("SQLite connection error: %s", e)
-    return conn
-
+        return None
 
-def create_tables(conn):
-    """Create tables in the SQLite database."""
+    # A connection whose PRAGMAs did not all apply is closed, not returned
     try:
-        cursor = conn.cursor()
-        # Enable foreign key constraints
-        cursor.execute("PRAGMA foreign_keys = ON;")  # Added Code
-
-        # ------------------------------------------------------------------
-        # Existing metadata table (kept as-is for your tests / infra)
-        # ------------------------------------------------------------------
-        cursor.execute(  #  Changed Code
-            """
-            CREATE TABLE IF NOT EXISTS metadata (
-                k TEXT PRIMARY KEY,
-                v TEXT
-            );
-            """
-        )
-
-        # ------------------------------------------------------------------
-        # Normalized academic structure
-        # ------------------------------------------------------------------
-
-        # Colleges
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Colleges (
-                college_id INTEGER PRIMARY KEY,
-                name TEXT UNIQUE NOT NULL
-            );
-            """
-        )
+        if bulk_load:
+            # Must precede the switch to WAL to keep the WAL index in heap memory
+            conn.execute("PRAGMA locking_mode=EXCLUSIVE;")
+        # WAL + synchronous=NORMAL: commits append to the WAL without a full
+        # fsync each time; temp tables/indexes in memory; 64 MiB page cache;
+        # reads through a 256 MiB memory map
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        conn.execute("PRAGMA mmap_size=268435456;")
+    except sqlite3.Error as e:
+        logger.error("Could not configure SQLite connection to %s: %s", db_file, e)
+        conn.close()
+        return None
 
-        # Departments
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Departments (
-                department_id INTEGER PRIMARY KEY,
-                college_id INTEGER,
-                name TEXT NOT NULL,
-                FOREIGN KEY (college_id)
-                    REFERENCES Colleges(college_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
+    logger.info("Connected to SQLite database: %s", db_file)
+    return conn
 
-        # Degree levels (e.g. Undergraduate, Graduate)
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Degree_Levels (
-                degree_level_id INTEGER PRIMARY KEY,
-                department_id INTEGER,
-                name TEXT NOT NULL,
-                FOREIGN KEY (department_id)
-                    REFERENCES Departments(department_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
 
-        # Degrees (e.g. B.S. Computer Science)
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Degrees (
-                degree_id INTEGER PRIMARY KEY,
-                degree_level_id INTEGER,
-                name TEXT NOT NULL,
-                FOREIGN KEY (degree_level_id)
-                    REFERENCES Degree_Levels(degree_level_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
+# Long-lived connections handed out by get_connection(), one per database file
+_CONNECTIONS = {}
+_CONNECTIONS_LOCK = threading.Lock()
 
-        # Requirements (e.g. "Major Requirements", "Support Courses")
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Requirements (
-                requirement_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                degree_id INTEGER NOT NULL,
-                type TEXT NOT NULL,
-                name TEXT NOT NULL,
-                FOREIGN KEY (degree_id)
-                    REFERENCES Degrees(degree_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
 
-        # Subcategories (e.g. Lower-Division Core, Upper-Division Core, etc.)
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Subcategories (
-                subcategory_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                requirement_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                FOREIGN KEY (requirement_id)
-                    REFERENCES Requirements(requirement_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
+def get_connection(db_file=None) -> Optional["sqlite3.Connection"]:
+    """
+    Return the process-wide connection to db_file (default: db/ai_advice.db
+    under the current directory), opening it on first use.
 
-        # NOTE from your comment (these are logical examples / seeds, not DDL):
-        # 1,1,Lower-Division Core
-        # 2,1,Upper-Division Core
-        # 3,1,Mathematics Requirements
-        # 4,1,Science and Mathematics Electives
-        # 5,1,Computer Science Electives
-
-        # Courses table keyed by subcategory (normalized over your old electives)
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Courses (
-                course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                subcategory_id INTEGER NOT NULL,
-                course_code TEXT UNIQUE NOT NULL,
-                name TEXT NOT NULL,
-                units INTEGER NOT NULL DEFAULT 3,
-                description TEXT,
-                prerequisites TEXT,
-                FOREIGN KEY (subcategory_id)
-                    REFERENCES Subcategories(subcategory_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
+    Reusing one connection keeps SQLite's page cache and statement cache warm
+    instead of reopening the file per operation. It may be used from any
+    thread (writes are serialized by SQLite); callers must not close it.
+    """
+    if db_file is None:
+        db_file = os.path.join(os.getcwd(), DB_DIRNAME, DB_FILENAME)
+    with _CONNECTIONS_LOCK:
+        conn = _CONNECTIONS.get(db_file)
+        if conn is None:
+            conn = create_connection(db_file, check_same_thread=False)
+            if conn is not None:
+                _CONNECTIONS[db_file] = conn
+    return conn
 
-        # Jobs table (target careers, tied to a degree)
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Jobs (
-                job_id INTEGER PRIMARY KEY,
-                degree_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                description TEXT,
-                FOREIGN KEY (degree_id)
-                    REFERENCES Degrees(degree_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
 
-        # ------------------------------------------------------------------
-        # Existing app tables that your GUI/tests already use
-        # ------------------------------------------------------------------
-
-        # users table (kept in lowercase and with the same columns so
-        # registration/login/tests keep working)
-        cursor.execute(  #  Changed Code
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                phone TEXT,
-                specialization TEXT,
-                password_hash TEXT NOT NULL
-            );
-            """
-        )
+def close_connections() -> None:
+    """Close every connection opened by get_connection() (runs at exit)."""
+    with _CONNECTIONS_LOCK:
+        while _CONNECTIONS:
+            _, conn = _CONNECTIONS.popitem()
+            conn.close()
 
-        # electives table (legacy table your tests and db_add.py use)
-        cursor.execute(  #  Changed Code
-            """
-            CREATE TABLE IF NOT EXISTS electives (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                course_code TEXT NOT NULL,
-                course_title TEXT NOT NULL,
-                category_id INTEGER NOT NULL,
-                credits INTEGER NOT NULL,
-                description TEXT,
-                prerequisites TEXT
-            );
-            """
-        )
 
-        # feedback table (legacy feedback used by your tests)
-        cursor.execute(  #  Changed Code
-            """
-            CREATE TABLE IF NOT EXISTS feedback (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                elective_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                comment TEXT NOT NULL,
-                rating REAL CHECK(rating >= 0.0 AND rating <= 5.0),
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (elective_id)
-                    REFERENCES electives(id),
-                FOREIGN KEY (user_id)
-                    REFERENCES users(id)
-            );
-            """
-        )
+atexit.register(close_connections)
 
-        # ------------------------------------------------------------------
-        # New normalized tables that hook into existing users/courses/jobs
-        # ------------------------------------------------------------------
-
-        # Prerequisites table referencing course_id instead of course_code
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS Prerequisites (
-                prerequisite_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                course_id INTEGER NOT NULL,
-                prerequisite_course_id INTEGER NOT NULL,
-                FOREIGN KEY (course_id)
-                    REFERENCES Courses(course_id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (prerequisite_course_id)
-                    REFERENCES Courses(course_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
 
-        # User_Preferences table – ties a user to their academic trajectory
-        # NOTE: FK now points to existing users(id) instead of a new Users table.
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS User_Preferences (
-                preference_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                college_id INTEGER,
-                department_id INTEGER,
-                degree_level_id INTEGER,
-                degree_id INTEGER,
-                job_id INTEGER,
-                FOREIGN KEY (user_id)
-                    REFERENCES users(id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (college_id)
-                    REFERENCES Colleges(college_id),
-                FOREIGN KEY (department_id)
-                    REFERENCES Departments(department_id),
-                FOREIGN KEY (degree_level_id)
-                    REFERENCES Degree_Levels(degree_level_id),
-                FOREIGN KEY (degree_id)
-                    REFERENCES Degrees(degree_id),
-                FOREIGN KEY (job_id)
-                    REFERENCES Jobs(job_id)
-                    ON DELETE SET NULL
-            );
-            """
-        )
+def create_tables(conn):
+    """Create tables in the SQLite database."""
+    try:
+        cursor = conn.cursor()
+        # Enable foreign key constraints (before BEGIN: a no-op inside a transaction)
+        cursor.execute("PRAGMA foreign_keys = ON;")  # Added Code
 
-        # Recommendations table – redesigned to attach recommendations
-        # to users, jobs, and normalized Courses.
-        cursor.execute(  #  Changed Code
-            """
-            CREATE TABLE IF NOT EXISTS recommendations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                job_id INTEGER,
-                course_id INTEGER,
-                rating REAL NOT NULL,
-                explanation TEXT NOT NULL,
-                rank INTEGER,
-                generated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id)
-                    REFERENCES users(id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (job_id)
-                    REFERENCES Jobs(job_id)
-                    ON DELETE CASCADE,
-                FOREIGN KEY (course_id)
-                    REFERENCES Courses(course_id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
-
-        # User_Interactions – audit trail for what the user did
-        cursor.execute(  # Added Code
-            """
-            CREATE TABLE IF NOT EXISTS User_Interactions (
-                interaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                action TEXT NOT NULL,
-                details TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id)
-                    REFERENCES users(id)
-                    ON DELETE CASCADE
-            );
-            """
-        )
+        # All CREATE TABLE statements in one executescript / one commit
+        cursor.executescript(_SCHEMA_SQL)
 
+        columns = {
+            row[1] for row in cursor.execute("PRAGMA table_info(recommendations);")
+        }
+        for name, index_columns in _RECOMMENDATIONS_INDEXES:
+            if columns.issuperset(index_columns):
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} "
+                    f"ON recommendations({', '.join(index_columns)});"
+                )
+            else:
+                logger.warning(
+                    "recommendations table has no %s column(s); skipping %s.",
+                    ", ".join(sorted(set(index_columns) - columns)),
+                    name,
+                )
         conn.commit()
         logger.info("All tables created successfully.")  #  Changed Code
 
@@ -324,563 +380,444 @@ def create_tables(conn):
         conn.rollback()
 
 
-def _get_script_dir() -> str:
-    """Helper to get the directory of this script."""
-    return os.path.dirname(os.path.abspath(__file__))
+def _batched(rows, n):
+    """Yield lists of at most n rows from any iterable (lists or generators)."""
+    it = iter(rows)
+    while batch := list(itertools.islice(it, n)):
+        yield batch
 
 
-def populate_colleges_data(conn):
+def _insert_rows(cursor, sql, rows, batch_size=None):
     """
-    Populate the Colleges table from colleges.csv.
-    CSV columns: college_id, name
+    Run sql for every row in executemany batches of batch_size (default
+    INSERT_BATCH_SIZE) inside one explicit transaction. rows may be any
+    iterable. On error the caller rolls back.
     """
-    try:
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM Colleges;")
-        count = cursor.fetchone()[0]
-        if count > 0:
-            logger.info("Colleges table already populated. Skipping CSV loading.")
-            return
-
-        csv_file_path = os.path.join(_get_script_dir(), "colleges.csv")
-        if not os.path.isfile(csv_file_path):
-            logger.error(
-                f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-            )
-            return
-
-        with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-
-            if "college_id" not in reader.fieldnames or "name" not in reader.fieldnames:
-                logger.error("CSV file must contain 'college_id' and 'name' columns.")
-                return
-
-            for row in reader:
-                college_id = row["college_id"].strip()
-                college_name = row["name"].strip()
-
-                if college_id and college_name:
-                    if college_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO Colleges (college_id, name)
-                            VALUES (?, ?);
-                            """,
-                            (int(college_id), college_name),
-                        )
-                        logger.info(
-                            f"Inserted college: {college_name} with ID: {college_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Invalid college_id '{college_id}' for college '{college_name}'. Skipping row."
-                        )
-                else:
-                    logger.warning(
-                        "Encountered empty 'college_id' or 'name' field. Skipping row."
-                    )
-
-        conn.commit()
-        logger.info("Colleges table populated from colleges.csv successfully.")
-
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
-    except csv.Error as e:
-        logger.error(f"Error reading CSV file: {e}")
-    except sqlite3.Error as e:
-        conn.rollback()
-        logger.error(f"An error occurred while populating Colleges: {e}")
-        raise
-
-
-def populate_departments_data(conn):
+    cursor.execute("BEGIN;")
+    for batch in _batched(rows, batch_size or INSERT_BATCH_SIZE):
+        cursor.executemany(sql, batch)
+    cursor.connection.commit()
+
+
+# Reference tables loaded straight from a CSV by _load_csv:
+# table -> (csv file, required CSV columns, inserted columns, integer columns,
+#           INSERT OR IGNORE?). Every inserted column must be non-empty.
+_CSV_TABLE_SPECS = {
+    "Colleges": (
+        "colleges.csv",
+        ("college_id", "name"),
+        ("college_id", "name"),
+        {"college_id"},
+        True,
+    ),
+    "Departments": (
+        "departments.csv",
+        ("department_id", "college_id", "name"),
+        ("department_id", "college_id", "name"),
+        {"department_id", "college_id"},
+        True,
+    ),
+    "Degree_Levels": (
+        "degree_levels.csv",
+        ("degree_level_id", "department_id", "name"),
+        ("degree_level_id", "department_id", "name"),
+        {"degree_level_id", "department_id"},
+        True,
+    ),
+    "Degrees": (
+        "degrees.csv",
+        ("degree_id", "degree_level_id", "name"),
+        ("degree_id", "degree_level_id", "name"),
+        {"degree_id", "degree_level_id"},
+        True,
+    ),
+    # requirement_id is ignored (AUTOINCREMENT)
+    "Requirements": (
+        "requirements.csv",
+        ("requirement_id", "degree_id", "type", "name"),
+        ("degree_id", "type", "name"),
+        {"degree_id"},
+        False,
+    ),
+    # subcategory_id is ignored (AUTOINCREMENT)
+    "Subcategories": (
+        "subcategories.csv",
+        ("subcategory_id", "requirement_id", "name"),
+        ("requirement_id", "name"),
+        {"requirement_id"},
+        False,
+    ),
+}
+
+
+# INSERT statement per reference table, built once so every load reuses the
+# same SQL string (and the connection's prepared-statement cache entry)
+_CSV_TABLE_INSERTS = {
+    table: (
+        f"INSERT {'OR IGNORE ' if or_ignore else ''}INTO {table} "
+        f"({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))});"
+    )
+    for table, (_, _, columns, _, or_ignore) in _CSV_TABLE_SPECS.items()
+}
+
+# Multi-row "VALUES (...), (...), ..." form of the same statements, so one
+# execute inserts many rows. Sized to stay under 999 bound parameters (the
+# SQLite default before 3.32) and 500 rows per statement.
+_MULTI_ROW_MAX_PARAMS = 999
+_MULTI_ROW_MAX_ROWS = 500
+
+
+def _multi_row_insert(single_row_sql, ncols):
+    """Return (rows per statement, multi-row SQL) for a single-row INSERT."""
+    rows_per_stmt = max(1, min(_MULTI_ROW_MAX_ROWS, _MULTI_ROW_MAX_PARAMS // ncols))
+    head, placeholders = single_row_sql.rstrip(";").rsplit(" VALUES ", 1)
+    sql = f"{head} VALUES {', '.join([placeholders] * rows_per_stmt)};"
+    return rows_per_stmt, sql
+
+
+_CSV_TABLE_MULTI_INSERTS = {
+    table: _multi_row_insert(_CSV_TABLE_INSERTS[table], len(spec[2]))
+    for table, spec in _CSV_TABLE_SPECS.items()
+}
+
+# courses.csv 'name': "<code>, <name>, (<units>)". The name part may itself
+# contain commas, so the code ends at the first comma and the units start
+# after the last one; the units part is optional. "MATH 150A, Calculus I (4)"
+# (units without their own comma) deliberately stays name="Calculus I (4)"
+# with default units: pulling them out would change already-loaded rows.
+_COURSE_NAME_RE = re.compile(r"\s*([^,]*?)\s*,\s*(.*?)\s*(?:,([^,]*))?")
+_COMMA_SPACING_RE = re.compile(r"\s*,\s*")
+
+
+def _split_course_name(full_name):
     """
-    Populate the Departments table from departments.csv.
-    CSV columns: department_id, college_id, name
+    Split a courses.csv 'name' into (course_code, course_name, units_str).
+    units_str is None when there is no units part; a name without any comma
+    is used as both code and name.
+    """
+    m = _COURSE_NAME_RE.fullmatch(full_name)
+    if m is None:
+        return full_name, full_name, None
+    course_code, course_name, units_str = m.groups()
+    if "," in course_name:
+        course_name = _COMMA_SPACING_RE.sub(", ", course_name)
+    if units_str is not None:
+        units_str = units_str.strip().strip("() ")
+    return course_code, course_name, units_str
+
+
+_INSERT_COURSES = """
+    INSERT INTO Courses (subcategory_id, course_code, name, units, description, prerequisites)
+    VALUES (?, ?, ?, ?, ?, ?);
+"""
+
+_INSERT_JOBS = """
+    INSERT OR IGNORE INTO Jobs (job_id, degree_id, name, description)
+    VALUES (?, ?, ?, ?);
+"""
+
+_INSERT_PREREQUISITES = """
+    INSERT OR IGNORE INTO Prerequisites (course_id, prerequisite_course_id)
+    VALUES (?, ?);
+"""
+
+
+# Every table populate_all_reference_data fills, in load order
+_REFERENCE_TABLES = (
+    "Colleges",
+    "Departments",
+    "Degree_Levels",
+    "Degrees",
+    "Requirements",
+    "Subcategories",
+    "Courses",
+    "Jobs",
+    "Prerequisites",
+)
+
+# Tables that may stay empty without blocking the user_version stamp
+# (prerequisites.csv is not shipped with the repo)
+_OPTIONAL_REFERENCE_TABLES = frozenset({"Prerequisites"})
+
+
+def _table_has_rows(cursor, table):
+    """True if table has at least one row (EXISTS stops at the first row)."""
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table});")
+    return bool(cursor.fetchone()[0])
+
+
+def _populated_tables(conn):
+    """Map each reference table to whether it has rows, in one query."""
+    sql = " UNION ALL ".join(
+        f"SELECT '{table}', EXISTS (SELECT 1 FROM {table})"
+        for table in _REFERENCE_TABLES
+    )
+    return {table: bool(flag) for table, flag in conn.execute(sql + ";")}
+
+
+def _load_csv(conn, table, already_populated=None):
     """
+    Populate one reference table from its CSV (see _CSV_TABLE_SPECS).
+    Skips the load if the table already has rows; already_populated (as
+    computed by _populated_tables) saves the check, None runs it here.
+
+    Returns True if the table has rows afterwards (already populated or
+    loaded), False if the CSV was missing, unreadable or yielded no rows.
+    The populate_*_data functions return the same.
+    """
+    csv_name, csv_columns, columns, int_columns, _ = _CSV_TABLE_SPECS[table]
+    int_positions = [i for i, col in enumerate(columns) if col in int_columns]
     try:
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM Departments;")
-        count = cursor.fetchone()[0]
-        if count > 0:
-            logger.info("Departments table already populated. Skipping CSV loading.")
-            return
+        if already_populated is None:
+            already_populated = _table_has_rows(cursor, table)
+        if already_populated:
+            logger.info("%s table already populated. Skipping CSV loading.", table)
+            return True
 
-        csv_file_path = os.path.join(_get_script_dir(), "departments.csv")
-        if not os.path.isfile(csv_file_path):
+        csv_file_path = _SCRIPT_DIR / csv_name
+        if not csv_file_path.is_file():
             logger.error(
                 f"CSV file not found at {csv_file_path}. Please ensure the file exists."
             )
-            return
+            return False
 
         with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+            # Positional rows: header resolved to indices once, no dict per row
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
 
-            if (
-                "department_id" not in reader.fieldnames
-                or "college_id" not in reader.fieldnames
-                or "name" not in reader.fieldnames
-            ):
+            missing_columns = set(csv_columns) - set(header)
+            if missing_columns:
                 logger.error(
-                    "CSV file must contain 'department_id', 'college_id', and 'name' columns."
+                    "CSV file %s is missing the following required columns: %s.",
+                    csv_name,
+                    ", ".join(sorted(missing_columns)),
                 )
-                return
-
-            for row in reader:
-                department_id = row["department_id"].strip()
-                college_id = row["college_id"].strip()
-                department_name = row["name"].strip()
-
-                if department_id and college_id and department_name:
-                    if department_id.isdigit() and college_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO Departments (department_id, college_id, name)
-                            VALUES (?, ?, ?);
-                            """,
-                            (int(department_id), int(college_id), department_name),
-                        )
-                        logger.info(
-                            f"Inserted department: {department_name} with ID: {department_id} "
-                            f"under College ID: {college_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Invalid department_id '{department_id}' or college_id '{college_id}' "
-                            f"for department '{department_name}'. Skipping row."
-                        )
-                else:
-                    logger.warning(
-                        "Encountered empty fields in departments.csv. Skipping row."
-                    )
-
-        conn.commit()
-        logger.info("Departments table populated from departments.csv successfully.")
-
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
-    except csv.Error as e:
-        logger.error(f"Error reading CSV file: {e}")
-    except sqlite3.Error as e:
-        conn.rollback()
-        logger.error(f"An error occurred while populating Departments: {e}")
-        raise
-
-
-def populate_degree_levels_data(conn):
-    """
-    Populate the Degree_Levels table from degree_levels.csv.
-    CSV columns: degree_level_id, department_id, name
-    """
-    try:
-        cursor = conn.cursor()
+                return False
 
-        cursor.execute("SELECT COUNT(*) FROM Degree_Levels;")
-        count = cursor.fetchone()[0]
-        if count > 0:
-            logger.info("Degree_Levels table already populated. Skipping CSV loading.")
-            return
+            positions = [header.index(col) for col in columns]
+            width = max(positions) + 1
 
-        csv_file_path = os.path.join(_get_script_dir(), "degree_levels.csv")
-        if not os.path.isfile(csv_file_path):
-            logger.error(
-                f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-            )
-            return
+            def clean(record):
+                """Return the insert tuple for a CSV record, or None if malformed."""
+                if len(record) < width:
+                    logger.debug(
+                        "Short row in %s: %s. Skipping row.", csv_name, record
+                    )
+                    return None
 
-        with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+                values = [record[i].strip() for i in positions]
 
-            if (
-                "degree_level_id" not in reader.fieldnames
-                or "department_id" not in reader.fieldnames
-                or "name" not in reader.fieldnames
-            ):
-                logger.error(
-                    "CSV file must contain 'degree_level_id', 'department_id', and 'name' columns."
-                )
-                return
-
-            for row in reader:
-                degree_level_id = row["degree_level_id"].strip()
-                department_id = row["department_id"].strip()
-                degree_level_name = row["name"].strip()
-
-                if degree_level_id and department_id and degree_level_name:
-                    if degree_level_id.isdigit() and department_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO Degree_Levels (degree_level_id, department_id, name)
-                            VALUES (?, ?, ?);
-                            """,
-                            (
-                                int(degree_level_id),
-                                int(department_id),
-                                degree_level_name,
-                            ),
-                        )
-                        logger.info(
-                            f"Inserted degree level: {degree_level_name} with ID: {degree_level_id} "
-                            f"under Department ID: {department_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Invalid degree_level_id '{degree_level_id}' or department_id '{department_id}' "
-                            f"for degree level '{degree_level_name}'. Skipping row."
-                        )
-                else:
-                    logger.warning(
-                        "Encountered empty fields in degree_levels.csv. Skipping row."
+                if not all(values):
+                    logger.debug(
+                        "Empty field in %s row %s. Skipping row.", csv_name, values
                     )
-
+                    return None
+                # Validated here rather than left to INTEGER affinity: SQLite
+                # would store "x" as TEXT in a plain INTEGER column and accept
+                # "12.0"/"-3", so bad ids must be caught before executemany
+                if not all(values[i].isdigit() for i in int_positions):
+                    logger.debug(
+                        "Invalid integer field in %s row %s. Skipping row.",
+                        csv_name,
+                        values,
+                    )
+                    return None
+
+                for i in int_positions:
+                    values[i] = int(values[i])
+                return tuple(values)
+
+            # filter(None, ...) drops blank lines (DictReader skipped these too)
+            cleaned = list(map(clean, filter(None, reader)))
+            rows = [values for values in cleaned if values is not None]
+            skipped = len(cleaned) - len(rows)
+
+        if skipped:
+            logger.warning("Skipped %d malformed rows in %s.", skipped, csv_name)
+
+        # All valid rows in INSERT_BATCH_SIZE batches, one transaction. Each
+        # batch goes in as multi-row INSERTs; the remainder that doesn't fill
+        # one uses the single-row statement.
+        rows_per_stmt, multi_sql = _CSV_TABLE_MULTI_INSERTS[table]
+        cursor.execute("BEGIN;")
+        for batch in _batched(rows, INSERT_BATCH_SIZE):
+            full = len(batch) - len(batch) % rows_per_stmt
+            if full:
+                cursor.executemany(
+                    multi_sql,
+                    (
+                        list(itertools.chain.from_iterable(chunk))
+                        for chunk in _batched(batch[:full], rows_per_stmt)
+                    ),
+                )
+            cursor.executemany(_CSV_TABLE_INSERTS[table], batch[full:])
         conn.commit()
         logger.info(
-            "Degree_Levels table populated from degree_levels.csv successfully."
+            "%s table populated from %s successfully (%d rows).",
+            table,
+            csv_name,
+            len(rows),
         )
+        return bool(rows)
 
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
     except csv.Error as e:
+        conn.rollback()
         logger.error(f"Error reading CSV file: {e}")
+        return False
     except sqlite3.Error as e:
         conn.rollback()
-        logger.error(f"An error occurred while populating Degree_Levels: {e}")
+        logger.error(f"An error occurred while populating {table}: {e}")
         raise
 
 
-def populate_degrees_data(conn):
+def populate_colleges_data(conn, already_populated=None):
     """
-    Populate the Degrees table from degrees.csv.
-    CSV columns: degree_id, degree_level_id, name
+    Populate the Colleges table from colleges.csv.
+    CSV columns: college_id, name
     """
-    try:
-        cursor = conn.cursor()
+    return _load_csv(conn, "Colleges", already_populated)
 
-        cursor.execute("SELECT COUNT(*) FROM Degrees;")
-        count = cursor.fetchone()[0]
-        if count > 0:
-            logger.info("Degrees table already populated. Skipping CSV loading.")
-            return
 
-        csv_file_path = os.path.join(_get_script_dir(), "degrees.csv")
-        if not os.path.isfile(csv_file_path):
-            logger.error(
-                f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-            )
-            return
+def populate_departments_data(conn, already_populated=None):
+    """
+    Populate the Departments table from departments.csv.
+    CSV columns: department_id, college_id, name
+    """
+    return _load_csv(conn, "Departments", already_populated)
 
-        with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
 
-            if (
-                "degree_id" not in reader.fieldnames
-                or "degree_level_id" not in reader.fieldnames
-                or "name" not in reader.fieldnames
-            ):
-                logger.error(
-                    "CSV file must contain 'degree_id', 'degree_level_id', and 'name' columns."
-                )
-                return
-
-            for row in reader:
-                degree_id = row["degree_id"].strip()
-                degree_level_id = row["degree_level_id"].strip()
-                degree_name = row["name"].strip()
-
-                if degree_id and degree_level_id and degree_name:
-                    if degree_id.isdigit() and degree_level_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO Degrees (degree_id, degree_level_id, name)
-                            VALUES (?, ?, ?);
-                            """,
-                            (int(degree_id), int(degree_level_id), degree_name),
-                        )
-                        logger.info(
-                            f"Inserted degree: {degree_name} with ID: {degree_id} "
-                            f"under Degree Level ID: {degree_level_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Invalid degree_id '{degree_id}' or degree_level_id '{degree_level_id}' "
-                            f"for degree '{degree_name}'. Skipping row."
-                        )
-                else:
-                    logger.warning(
-                        "Encountered empty fields in degrees.csv. Skipping row."
-                    )
+def populate_degree_levels_data(conn, already_populated=None):
+    """
+    Populate the Degree_Levels table from degree_levels.csv.
+    CSV columns: degree_level_id, department_id, name
+    """
+    return _load_csv(conn, "Degree_Levels", already_populated)
 
-        conn.commit()
-        logger.info("Degrees table populated from degrees.csv successfully.")
 
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
-    except csv.Error as e:
-        logger.error(f"Error reading CSV file: {e}")
-    except sqlite3.Error as e:
-        conn.rollback()
-        logger.error(f"An error occurred while populating Degrees: {e}")
-        raise
+def populate_degrees_data(conn, already_populated=None):
+    """
+    Populate the Degrees table from degrees.csv.
+    CSV columns: degree_id, degree_level_id, name
+    """
+    return _load_csv(conn, "Degrees", already_populated)
 
 
-def populate_requirements_data(conn):
+def populate_requirements_data(conn, already_populated=None):
     """
     Populate the Requirements table from requirements.csv.
     CSV columns: requirement_id, degree_id, type, name
     requirement_id is ignored (AUTOINCREMENT); we insert (degree_id, type, name).
     """
-    try:
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM Requirements;")
-        count = cursor.fetchone()[0]
-        if count > 0:
-            logger.info("Requirements table already populated. Skipping CSV loading.")
-            return
-
-        csv_file_path = os.path.join(_get_script_dir(), "requirements.csv")
-        if not os.path.isfile(csv_file_path):
-            logger.error(
-                f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-            )
-            return
+    return _load_csv(conn, "Requirements", already_populated)
 
-        with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-
-            if (
-                "requirement_id" not in reader.fieldnames
-                or "degree_id" not in reader.fieldnames
-                or "type" not in reader.fieldnames
-                or "name" not in reader.fieldnames
-            ):
-                logger.error(
-                    "CSV file must contain 'requirement_id', 'degree_id', 'type', and 'name' columns."
-                )
-                return
-
-            for row in reader:
-                degree_id = row["degree_id"].strip()
-                req_type = row["type"].strip()
-                req_name = row["name"].strip()
-
-                if degree_id and req_type and req_name:
-                    if degree_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT INTO Requirements (degree_id, type, name)
-                            VALUES (?, ?, ?);
-                            """,
-                            (int(degree_id), req_type, req_name),
-                        )
-                        logger.info(
-                            f"Inserted requirement: {req_name} for Degree ID: {degree_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Invalid degree_id '{degree_id}' for requirement '{req_name}'. Skipping row."
-                        )
-                else:
-                    logger.warning(
-                        "Encountered empty fields in requirements.csv. Skipping row."
-                    )
 
-        conn.commit()
-        logger.info("Requirements table populated from requirements.csv successfully.")
-
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
-    except csv.Error as e:
-        logger.error(f"Error reading CSV file: {e}")
-    except sqlite3.Error as e:
-        conn.rollback()
-        logger.error(f"An error occurred while populating Requirements: {e}")
-        raise
-
-
-def populate_subcategories_data(conn):
+def populate_subcategories_data(conn, already_populated=None):
     """
     Populate the Subcategories table from subcategories.csv.
     CSV columns: subcategory_id, requirement_id, name
     subcategory_id is ignored (AUTOINCREMENT); we insert (requirement_id, name).
     """
-    try:
-        cursor = conn.cursor()
+    return _load_csv(conn, "Subcategories", already_populated)
 
-        cursor.execute("SELECT COUNT(*) FROM Subcategories;")
-        count = cursor.fetchone()[0]
-        if count > 0:
-            logger.info("Subcategories table already populated. Skipping CSV loading.")
-            return
 
-        csv_file_path = os.path.join(_get_script_dir(), "subcategories.csv")
-        if not os.path.isfile(csv_file_path):
-            logger.error(
-                f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-            )
-            return
-
-        with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-
-            if (
-                "subcategory_id" not in reader.fieldnames
-                or "requirement_id" not in reader.fieldnames
-                or "name" not in reader.fieldnames
-            ):
-                logger.error(
-                    "CSV file must contain 'subcategory_id', 'requirement_id', and 'name' columns."
-                )
-                return
-
-            for row in reader:
-                requirement_id = row["requirement_id"].strip()
-                subcat_name = row["name"].strip()
-
-                if requirement_id and subcat_name:
-                    if requirement_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT INTO Subcategories (requirement_id, name)
-                            VALUES (?, ?);
-                            """,
-                            (int(requirement_id), subcat_name),
-                        )
-                        logger.info(
-                            f"Inserted subcategory: {subcat_name} under Requirement ID: {requirement_id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Invalid requirement_id '{requirement_id}' for subcategory '{subcat_name}'. Skipping row."
-                        )
-                else:
-                    logger.warning(
-                        "Encountered empty fields in subcategories.csv. Skipping row."
-                    )
-
-        conn.commit()
-        logger.info(
-            "Subcategories table populated from subcategories.csv successfully."
-        )
-
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
-    except csv.Error as e:
-        logger.error(f"Error reading CSV file: {e}")
-    except sqlite3.Error as e:
-        conn.rollback()
-        logger.error(f"An error occurred while populating Subcategories: {e}")
-        raise
-
-
-def populate_courses_data(conn):
+def populate_courses_data(conn, already_populated=None):
     """
     Populate the Courses table from courses.csv.
     CSV columns: course_id, subcategory_id, name, description, prerequisites
     - 'name' is parsed into (course_code, course_name, units) as:
       "CPSC 120, Introduction to Programming, (3)"
+
+    already_populated: see _load_csv.
     """
     try:
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM Courses;")
-        count = cursor.fetchone()[0]
-        if count > 0:
+        if already_populated is None:
+            already_populated = _table_has_rows(cursor, "Courses")
+        if already_populated:
             logger.info("Courses table already populated. Skipping CSV loading.")
-            return
+            return True
 
-        csv_file_path = os.path.join(_get_script_dir(), "courses.csv")
-        if not os.path.isfile(csv_file_path):
+        csv_file_path = _SCRIPT_DIR / "courses.csv"
+        if not csv_file_path.is_file():
             logger.error(
                 f"CSV file not found at {csv_file_path}. Please ensure the file exists."
             )
-            return
+            return False
 
         with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+            # Positional rows: header resolved to indices once, no dict per row
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
 
-            required_columns = {
+            required_columns = (
                 "course_id",
                 "subcategory_id",
                 "name",
                 "description",
                 "prerequisites",
-            }
-            missing_columns = required_columns - set(reader.fieldnames)
+            )
+            missing_columns = set(required_columns) - set(header)
             if missing_columns:
                 logger.error(
                     f"CSV file is missing the following required columns: {', '.join(missing_columns)}."
                 )
-                return
+                return False
+
+            positions = [header.index(col) for col in required_columns]
+            width = max(positions) + 1
+            rows = []
+            skipped = 0
+            for record in reader:
+                if not record:
+                    continue  # blank line (DictReader skipped these as well)
+                if len(record) < width:
+                    skipped += 1
+                    logger.debug("Short row in courses.csv: %s. Skipping row.", record)
+                    continue
 
-            for row in reader:
-                course_id = row["course_id"].strip()
-                subcategory_id = row["subcategory_id"].strip()
-                full_name = row["name"].strip()
-                course_description = row["description"].strip()
-                prerequisites = row["prerequisites"].strip()
+                (
+                    course_id,
+                    subcategory_id,
+                    full_name,
+                    course_description,
+                    prerequisites,
+                ) = (record[i].strip() for i in positions)
 
-                course_code = None
-                course_name = None
                 units = 3  # default
 
-                try:
-                    parts = [part.strip() for part in full_name.split(",")]
-                    if len(parts) >= 3:
-                        course_code = parts[0]
-                        course_name = ", ".join(parts[1:-1])
-                        units_str = parts[-1].strip("() ")
-                        if units_str.isdigit():
-                            units = int(units_str)
-                        else:
-                            logger.warning(
-                                f"Invalid units '{units_str}' for course '{course_code}'. "
-                                f"Using default units: {units}."
-                            )
-                    elif len(parts) == 2:
-                        course_code = parts[0]
-                        course_name = parts[1]
+                course_code, course_name, units_str = _split_course_name(full_name)
+                if units_str is not None:
+                    if units_str.isdigit():
+                        units = int(units_str)
                     else:
-                        course_code = parts[0] if parts else None
-                        course_name = full_name
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to parse 'name' field '{full_name}' for course_id '{course_id}': {e}. Skipping row."
-                    )
-                    continue
+                        logger.warning(
+                            "Invalid units '%s' for course '%s'. Using default units: %d.",
+                            units_str,
+                            course_code,
+                            units,
+                        )
 
                 if not all([course_id, subcategory_id, course_code, course_name]):
-                    logger.warning(
+                    skipped += 1
+                    logger.debug(
                         "One or more required fields are missing in a row. Skipping row."
                     )
                     continue
 
                 if not (course_id.isdigit() and subcategory_id.isdigit()):
-                    logger.warning(
-                        f"Invalid data types for course_id '{course_id}' or subcategory_id '{subcategory_id}'. Skipping row."
+                    skipped += 1
+                    logger.debug(
+                        "Invalid data types for course_id '%s' or subcategory_id '%s'. Skipping row.",
+                        course_id,
+                        subcategory_id,
                     )
                     continue
 
-                cursor.execute(
-                    """
-                    INSERT INTO Courses (subcategory_id, course_code, name, units, description, prerequisites)
-                    VALUES (?, ?, ?, ?, ?, ?);
-                    """,
+                rows.append(
                     (
                         int(subcategory_id),
                         course_code,
@@ -888,199 +825,231 @@ def populate_courses_data(conn):
                         units,
                         course_description,
                         prerequisites,
-                    ),
-                )
-                logger.info(
-                    f"Inserted course: {course_name} ({course_code}) under Subcategory ID: {subcategory_id} "
-                    f"with units: {units}"
+                    )
                 )
 
-        conn.commit()
-        logger.info("Courses table populated from courses.csv successfully.")
+        if skipped:
+            logger.warning("Skipped %d malformed rows in courses.csv.", skipped)
 
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
+        _insert_rows(cursor, _INSERT_COURSES, rows)
+        logger.info(
+            "Courses table populated from courses.csv successfully (%d rows).",
+            len(rows),
         )
+        return bool(rows)
+
     except csv.Error as e:
+        conn.rollback()
         logger.error(f"Error reading CSV file: {e}")
+        return False
     except sqlite3.IntegrityError as e:
+        conn.rollback()
         logger.error(f"Integrity error while populating Courses: {e}")
+        return False
     except sqlite3.Error as e:
         conn.rollback()
         logger.error(f"An error occurred while populating Courses: {e}")
         raise
 
 
-def populate_jobs_data(conn):
+def populate_jobs_data(conn, already_populated=None):
     """
     Populate the Jobs table from jobs.csv.
     CSV columns: job_id, degree_id, name, description
+
+    already_populated: see _load_csv.
     """
     try:
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM Jobs;")
-        count = cursor.fetchone()[0]
-        if count > 0:
+        if already_populated is None:
+            already_populated = _table_has_rows(cursor, "Jobs")
+        if already_populated:
             logger.info("Jobs table already populated. Skipping CSV loading.")
-            return
+            return True
 
-        csv_file_path = os.path.join(_get_script_dir(), "jobs.csv")
-        if not os.path.isfile(csv_file_path):
+        csv_file_path = _SCRIPT_DIR / "jobs.csv"
+        if not csv_file_path.is_file():
             logger.error(
                 f"CSV file not found at {csv_file_path}. Please ensure the file exists."
             )
-            return
+            return False
 
         with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+            # Positional rows: header resolved to indices once, no dict per row
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
 
-            required_columns = {"job_id", "degree_id", "name", "description"}
-            if not required_columns.issubset(reader.fieldnames):
+            required_columns = ("job_id", "degree_id", "name", "description")
+            if not set(required_columns).issubset(header):
                 logger.error(
                     f"CSV file must contain the following columns: {', '.join(required_columns)}."
                 )
-                return
+                return False
 
-            for row in reader:
-                job_id = row["job_id"].strip()
-                degree_id = row["degree_id"].strip()
-                job_name = row["name"].strip()
-                job_description = row["description"].strip()
+            positions = [header.index(col) for col in required_columns]
+            width = max(positions) + 1
+            rows = []
+            skipped = 0
+            for record in reader:
+                if not record:
+                    continue  # blank line (DictReader skipped these as well)
+                if len(record) < width:
+                    skipped += 1
+                    logger.debug("Short row in jobs.csv: %s. Skipping row.", record)
+                    continue
+
+                job_id, degree_id, job_name, job_description = (
+                    record[i].strip() for i in positions
+                )
 
                 if job_id and degree_id and job_name:
                     if job_id.isdigit() and degree_id.isdigit():
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO Jobs (job_id, degree_id, name, description)
-                            VALUES (?, ?, ?, ?);
-                            """,
-                            (int(job_id), int(degree_id), job_name, job_description),
-                        )
-                        logger.info(
-                            f"Inserted job: {job_name} with ID: {job_id} under Degree ID: {degree_id}"
+                        rows.append(
+                            (int(job_id), int(degree_id), job_name, job_description)
                         )
                     else:
-                        logger.warning(
-                            f"Invalid job_id '{job_id}' or degree_id '{degree_id}' for job '{job_name}'. Skipping row."
+                        skipped += 1
+                        logger.debug(
+                            "Invalid job_id '%s' or degree_id '%s' for job '%s'. Skipping row.",
+                            job_id,
+                            degree_id,
+                            job_name,
                         )
                 else:
-                    logger.warning(
+                    skipped += 1
+                    logger.debug(
                         "Encountered empty 'job_id', 'degree_id', or 'name' field in jobs.csv. Skipping row."
                     )
 
-        conn.commit()
-        logger.info("Jobs table populated from jobs.csv successfully.")
+        if skipped:
+            logger.warning("Skipped %d malformed rows in jobs.csv.", skipped)
 
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
+        _insert_rows(cursor, _INSERT_JOBS, rows)
+        logger.info(
+            "Jobs table populated from jobs.csv successfully (%d rows).", len(rows)
         )
+        return bool(rows)
+
     except csv.Error as e:
+        conn.rollback()
         logger.error(f"Error reading CSV file: {e}")
+        return False
     except sqlite3.IntegrityError as e:
+        conn.rollback()
         logger.error(f"Integrity error while populating Jobs: {e}")
+        return False
     except sqlite3.Error as e:
         conn.rollback()
         logger.error(f"An error occurred while populating Jobs: {e}")
         raise
 
 
-def populate_prerequisites_data(conn):
+def populate_prerequisites_data(conn, already_populated=None):
     """
     Populate the Prerequisites table from prerequisites.csv.
     CSV columns: course_code, prerequisite_course_code
 
-    - Looks up course_id and prerequisite_course_id in Courses by course_code.
+    - Resolves course_id and prerequisite_course_id from a course_code -> course_id
+      dict read from Courses in one query (no per-row lookups).
     - Inserts into Prerequisites (course_id, prerequisite_course_id).
+
+    already_populated: see _load_csv.
     """
     try:
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM Prerequisites;")
-        count = cursor.fetchone()[0]
-        if count > 0:
+        if already_populated is None:
+            already_populated = _table_has_rows(cursor, "Prerequisites")
+        if already_populated:
             logger.info("Prerequisites table already populated. Skipping CSV loading.")
-            return
+            return True
 
-        csv_file_path = os.path.join(_get_script_dir(), "prerequisites.csv")
-        if not os.path.isfile(csv_file_path):
+        csv_file_path = _SCRIPT_DIR / "prerequisites.csv"
+        if not csv_file_path.is_file():
             logger.error(
                 f"CSV file not found at {csv_file_path}. Please ensure the file exists."
             )
-            return
+            return False
 
         with open(csv_file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
+            # Positional rows: header resolved to indices once, no dict per row
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
 
-            required_columns = {"course_code", "prerequisite_course_code"}
-            if not required_columns.issubset(reader.fieldnames):
+            required_columns = ("course_code", "prerequisite_course_code")
+            if not set(required_columns).issubset(header):
                 logger.error(
                     f"CSV file must contain the following columns: {', '.join(required_columns)}."
                 )
-                return
+                return False
+
+            code_pos, prereq_pos = (header.index(col) for col in required_columns)
+            width = max(code_pos, prereq_pos) + 1
+            course_ids = dict(
+                cursor.execute("SELECT course_code, course_id FROM Courses;")
+            )
+            rows = []
+            skipped = 0
+            for record in reader:
+                if not record:
+                    continue  # blank line (DictReader skipped these as well)
+                if len(record) < width:
+                    skipped += 1
+                    logger.debug(
+                        "Short row in prerequisites.csv: %s. Skipping row.", record
+                    )
+                    continue
 
-            for row in reader:
-                course_code = row["course_code"].strip()
-                prereq_code = row["prerequisite_course_code"].strip()
+                course_code = record[code_pos].strip()
+                prereq_code = record[prereq_pos].strip()
 
                 if not course_code or not prereq_code:
-                    logger.warning(
+                    skipped += 1
+                    logger.debug(
                         "Empty course_code or prerequisite_course_code in prerequisites.csv. Skipping row."
                     )
                     continue
 
-                # Look up IDs for the codes
-                cursor.execute(
-                    "SELECT course_id FROM Courses WHERE course_code = ?;",
-                    (course_code,),
-                )
-                course_row = cursor.fetchone()
-                if not course_row:
-                    logger.warning(
-                        f"Course with code '{course_code}' not found in Courses table. Skipping row."
+                # Look up IDs for the codes (one query up front, not two per row)
+                course_id = course_ids.get(course_code)
+                if course_id is None:
+                    skipped += 1
+                    logger.debug(
+                        "Course with code '%s' not found in Courses table. Skipping row.",
+                        course_code,
                     )
                     continue
-                course_id = course_row[0]
 
-                cursor.execute(
-                    "SELECT course_id FROM Courses WHERE course_code = ?;",
-                    (prereq_code,),
-                )
-                prereq_row = cursor.fetchone()
-                if not prereq_row:
-                    logger.warning(
-                        f"Prerequisite course with code '{prereq_code}' not found in Courses table. Skipping row."
+                prereq_id = course_ids.get(prereq_code)
+                if prereq_id is None:
+                    skipped += 1
+                    logger.debug(
+                        "Prerequisite course with code '%s' not found in Courses table. Skipping row.",
+                        prereq_code,
                     )
                     continue
-                prereq_id = prereq_row[0]
 
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO Prerequisites (course_id, prerequisite_course_id)
-                    VALUES (?, ?);
-                    """,
-                    (course_id, prereq_id),
-                )
-                logger.info(
-                    f"Inserted prerequisite: {course_code} requires {prereq_code} "
-                    f"(course_id={course_id}, prerequisite_course_id={prereq_id})"
-                )
+                rows.append((course_id, prereq_id))
 
-        conn.commit()
+        if skipped:
+            logger.warning("Skipped %d malformed rows in prerequisites.csv.", skipped)
+
+        _insert_rows(cursor, _INSERT_PREREQUISITES, rows)
         logger.info(
-            "Prerequisites table populated from prerequisites.csv successfully."
+            "Prerequisites table populated from prerequisites.csv successfully (%d rows).",
+            len(rows),
         )
+        return bool(rows)
 
-    except FileNotFoundError:
-        logger.error(
-            f"CSV file not found at {csv_file_path}. Please ensure the file exists."
-        )
     except csv.Error as e:
+        conn.rollback()
         logger.error(f"Error reading CSV file: {e}")
+        return False
     except sqlite3.IntegrityError as e:
+        conn.rollback()
         logger.error(f"Integrity error while populating Prerequisites: {e}")
+        return False
     except sqlite3.Error as e:
         conn.rollback()
         logger.error(f"An error occurred while populating Prerequisites: {e}")
@@ -1091,17 +1060,61 @@ def populate_all_reference_data(conn):
     """
     Convenience function to populate all core reference tables
     in dependency-safe order.
-    """
-    populate_colleges_data(conn)
-    populate_departments_data(conn)
-    populate_degree_levels_data(conn)
-    populate_degrees_data(conn)
-    populate_requirements_data(conn)
-    populate_subcategories_data(conn)
-    populate_courses_data(conn)
-    populate_jobs_data(conn)
-    populate_prerequisites_data(conn)
 
+    UNIQUE constraints and foreign keys stay enforced during the load on
+    purpose: INSERT OR IGNORE on Colleges/Jobs and the IntegrityError
+    handling in populate_courses_data rely on them to drop duplicate rows,
+    and a bad parent id should fail its own table's load, not surface later
+    from a deferred CREATE UNIQUE INDEX or foreign_key_check.
+
+    The loaders run one after another on the caller's connection. SQLite
+    allows a single writer per file even in WAL mode, and the whole load takes
+    a few milliseconds, so per-table threads and connections would only add
+    lock contention (and could not share a ':memory:' database at all).
+
+    Once every required table has rows the database is stamped with
+    REFERENCE_DATA_VERSION via PRAGMA user_version, so later starts skip even
+    the per-table EXISTS probes with a single header read. A partial load
+    (missing or bad CSV) is not stamped, so the next start retries it.
+    """
+    (user_version,) = conn.execute("PRAGMA user_version;").fetchone()
+    if user_version >= REFERENCE_DATA_VERSION:
+        logger.info(
+            "Reference data already populated (user_version=%d). Skipping.",
+            user_version,
+        )
+        return
+
+    # One probe for every table instead of one query per loader
+    populated = _populated_tables(conn)
+    loaded = {
+        "Colleges": populate_colleges_data(conn, populated["Colleges"]),
+        "Departments": populate_departments_data(conn, populated["Departments"]),
+        "Degree_Levels": populate_degree_levels_data(conn, populated["Degree_Levels"]),
+        "Degrees": populate_degrees_data(conn, populated["Degrees"]),
+        "Requirements": populate_requirements_data(conn, populated["Requirements"]),
+        "Subcategories": populate_subcategories_data(
+            conn, populated["Subcategories"]
+        ),
+        "Courses": populate_courses_data(conn, populated["Courses"]),
+        "Jobs": populate_jobs_data(conn, populated["Jobs"]),
+        "Prerequisites": populate_prerequisites_data(
+            conn, populated["Prerequisites"]
+        ),
+    }
+
+    missing = [
+        table
+        for table, ok in loaded.items()
+        if not ok and table not in _OPTIONAL_REFERENCE_TABLES
+    ]
+    if missing:
+        logger.warning(
+            "Reference data incomplete (%s); user_version not stamped.",
+            ", ".join(missing),
+        )
+    else:
+        conn.execute(f"PRAGMA user_version = {REFERENCE_DATA_VERSION};")
     logger.info("All reference data population routines have been executed.")
 
 
@@ -1120,22 +1133,26 @@ def main_int_db(database: Optional[str] = None) -> None:
 
     db_path = os.path.join(db_directory, database)
 
-    conn = create_connection(db_path)
+    conn = create_connection(db_path, bulk_load=True)
+    if conn is None:
+        # The exclusive lock fails while another connection has the file open;
+        # it is only a speed-up, so load through a normal connection instead
+        logger.warning(
+            "Could not lock %s for bulk loading; retrying without the lock.", db_path
+        )
+        conn = create_connection(db_path)
+    if conn is None:
+        raise sqlite3.Error(f"Cannot create the database connection to {db_path}")
 
-    if conn is not None:
-        try:
-            create_tables(conn)
-            populate_all_reference_data(conn)
-        except Exception as e:
-            logger.error(
-                "An error occurred during database setup at %s: %s", db_path, e
-            )
-            raise
-        finally:
-            conn.close()
-            logger.info("Database setup completed. Database file: %s", db_path)
-    else:
-        logger.error("Error! Cannot create the database connection.")
+    try:
+        create_tables(conn)
+        populate_all_reference_data(conn)
+    except Exception as e:
+        logger.error("An error occurred during database setup at %s: %s", db_path, e)
+        raise
+    finally:
+        conn.close()
+        logger.info("Database setup completed. Database file: %s", db_path)
 
 
 def main_test_db(option: int) -> bool:
@@ -39,6 +39,26 @@ def isolate_env(monkeypatch):
     # but you could add explicit cleanup after the yield if needed.
 
 
+@pytest.fixture(autouse=True)
+def reset_ai_caches():
+    """
+    Clear the ai_module process-lifetime caches around every test.
+
+    Several tests chdir into tmp_path (or monkeypatch _find_courses_json /
+    importlib.util.find_spec) and expect a fresh lookup, so values cached by an
+    earlier test must not leak across tests.
+    """
+    from ai_integration import ai_module
+
+    ai_module._invalidate_courses_json_cache()
+    ai_module.refresh_env()
+    ai_module._build_prompt.cache_clear()
+    yield
+    ai_module._invalidate_courses_json_cache()
+    ai_module.refresh_env()
+    ai_module._build_prompt.cache_clear()
+
+
 @pytest.fixture
 def valid_api_key(monkeypatch):
     """
@@ -25,3 +25,20 @@ def test_fake_chatgpt_bad_json(monkeypatch, tmp_path):
     monkeypatch.chdir(tmp_path)
     with pytest.raises(json.JSONDecodeError):
         ai.fake_chatgpt_response(1, "Web Dev", "BSc", [])
+
+
+def test_fake_chatgpt_reloads_when_file_changes(monkeypatch, tmp_path):
+    monkeypatch.delenv("AI_ENABLED", raising=False)
+    courses = tmp_path / "courses.json"
+    courses.write_text('[{"Number": 1}]', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    first = ai.fake_chatgpt_response_bytes(1, "Web Dev", "BSc", [])
+    assert ai.fake_chatgpt_response_bytes(1, "Web Dev", "BSc", []) is first
+    assert ai.fake_chatgpt_response(1, "Web Dev", "BSc", []) == first.decode("utf-8")
+
+    courses.write_text('[{"Number": 1}, {"Number": 2}]', encoding="utf-8")
+    assert json.loads(ai.fake_chatgpt_response(1, "Web Dev", "BSc", [])) == [
+        {"Number": 1},
+        {"Number": 2},
+    ]
@@ -66,6 +66,16 @@ def test_main_test_ai_option3_returns_true_when_openai_present(
     assert ai.main_test_ai(3) is True  # Added Code
 
 
+def test_refresh_env_rechecks_openai_availability(monkeypatch):
+    """The find_spec result is cached until refresh_env() drops it."""
+    monkeypatch.setattr(ai.importlib.util, "find_spec", lambda name: None)
+    assert ai.main_test_ai(3) is False
+    monkeypatch.setattr(ai.importlib.util, "find_spec", lambda name: object())
+    assert ai.main_test_ai(3) is False
+    ai.refresh_env()
+    assert ai.main_test_ai(3) is True
+
+
 # ----------------------------- main_test_ai (option 4) -----------------------------  # Added Code
 
 
@@ -86,3 +96,353 @@ def test_ai_option4_smoke(monkeypatch, tmp_path):
 def test_main_test_ai_unknown_option_returns_false():  # Added Code
     """Unknown option path should return False."""  # Added Code
     assert ai.main_test_ai(999) is False  # Added Code
+
+
+def test_ai_option4_accepts_string_numbers(monkeypatch, tmp_path):
+    """Numbers serialized as strings (e.g. "7") still count toward 1..10."""
+    monkeypatch.delenv("AI_ENABLED", raising=False)
+    items = [{"Number": str(n)} for n in range(1, 10)] + [{"Number": 10}]
+    (tmp_path / "courses.json").write_text(json.dumps(items), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    assert ai.main_test_ai(4) is True
+
+
+def test_ai_option4_rejects_non_numeric_numbers(monkeypatch, tmp_path):
+    """Malformed Number values are ignored, so the missing one fails validation."""
+    monkeypatch.delenv("AI_ENABLED", raising=False)
+    items = [{"Number": n} for n in range(1, 10)] + [{"Number": "ten"}]
+    (tmp_path / "courses.json").write_text(json.dumps(items), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    assert ai.main_test_ai(4) is False
+
+
+# ----------------------------- get_recommendations_ai_batch -----------------------------
+def test_get_recommendations_ai_batch_splits_single_model_call(
+    monkeypatch, valid_api_key
+):
+    """Real mode sends one prompt for all jobs and splits the reply per JOB marker."""
+    monkeypatch.setenv("AI_ENABLED", "true")
+    assert ai.main_int_ai() is True  # builds prompt_template
+
+    calls = []
+
+    class _Reply:
+        content = (
+            "===JOB 2===\n"
+            "**Number:** 1\n**Course Code:** CPSC 449\n**Rating:** 90\n"
+            "===JOB 1===\n"
+            "**Number:** 1\n**Course Code:** CPSC 483\n**Rating:** 100\n"
+        )
+
+    class _Model:
+        def invoke(self, prompt):
+            calls.append(prompt)
+            return _Reply()
+
+    monkeypatch.setattr(ai, "model", _Model())
+    electives = [
+        {
+            "prerequisites": "None",
+            "course_code": "CPSC 483",
+            "units": 3,
+            "name": "ML",
+            "description": "d",
+        }
+    ]
+    results = ai.get_recommendations_ai_batch(
+        [
+            dict(
+                job_id=1, job_name="AI", degree_name="BSc", degree_electives=electives
+            ),
+            dict(
+                job_id=2, job_name="Web", degree_name="BSc", degree_electives=electives
+            ),
+            dict(
+                job_id=3, job_name="Game", degree_name="BSc", degree_electives=electives
+            ),
+        ]
+    )
+
+    assert len(calls) == 1
+    assert json.loads(results[0])[0]["Course Code"] == "CPSC 483"
+    assert json.loads(results[1])[0]["Course Code"] == "CPSC 449"
+    assert results[2] == "[]"
+
+
+def test_get_recommendations_ai_batch_keeps_repeated_job_ids_apart(
+    monkeypatch, valid_api_key
+):
+    """Sections are matched by position, so two requests sharing a job_id differ."""
+    monkeypatch.setenv("AI_ENABLED", "true")
+    assert ai.main_int_ai() is True
+
+    calls = []
+
+    class _Reply:
+        content = (
+            "===JOB 1===\n"
+            "**Number:** 1\n**Course Code:** CPSC 483\n**Rating:** 100\n"
+            "===JOB 2===\n"
+            "**Number:** 1\n**Course Code:** CPSC 449\n**Rating:** 90\n"
+        )
+
+    class _Model:
+        def invoke(self, prompt):
+            calls.append(prompt)
+            return _Reply()
+
+    monkeypatch.setattr(ai, "model", _Model())
+    results = ai.get_recommendations_ai_batch(
+        [
+            dict(job_id=7, job_name="AI", degree_name="BSc", degree_electives=[]),
+            dict(job_id=7, job_name="AI", degree_name="BA", degree_electives=[]),
+        ]
+    )
+
+    prompt_text = calls[0].to_string()
+    assert "===JOB 1===" in prompt_text and "===JOB 2===" in prompt_text
+    assert json.loads(results[0])[0]["Course Code"] == "CPSC 483"
+    assert json.loads(results[1])[0]["Course Code"] == "CPSC 449"
+
+
+# ----------------------------- gather_recommendations -----------------------------
+def test_gather_recommendations_limits_concurrency(monkeypatch, valid_api_key):
+    """Async calls run concurrently but never exceed AI_CONCURRENCY in flight."""
+    import asyncio
+
+    monkeypatch.setenv("AI_ENABLED", "true")
+    monkeypatch.setenv("AI_CONCURRENCY", "2")
+    monkeypatch.setenv("AI_LEGACY_MARKDOWN", "1")
+    assert ai.main_int_ai() is True
+
+    in_flight = 0
+    peak = 0
+
+    class _Reply:
+        content = "**Number:** 1\n**Course Code:** CPSC 483\n"
+
+    class _Model:
+        async def ainvoke(self, prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _Reply()
+
+    monkeypatch.setattr(ai, "model", _Model())
+    items = [
+        dict(job_id=i, job_name="AI", degree_name="BSc", degree_electives=[])
+        for i in range(5)
+    ]
+    results = asyncio.run(ai.gather_recommendations(items))
+
+    assert len(results) == 5
+    assert all(json.loads(r)[0]["Course Code"] == "CPSC 483" for r in results)
+    assert peak == 2
+
+
+def test_aget_recommendations_ai_uses_json_mode_by_default(monkeypatch, valid_api_key):
+    """Without AI_LEGACY_MARKDOWN the async path binds the JSON response format."""
+    import asyncio
+
+    monkeypatch.setenv("AI_ENABLED", "true")
+    monkeypatch.delenv("AI_LEGACY_MARKDOWN", raising=False)
+    assert ai.main_int_ai() is True
+    bound_kwargs = {}
+
+    class _Reply:
+        content = '{"courses": [{"Number": 1, "Course Code": "CPSC 483"}]}'
+
+    class _Model:
+        def bind(self, **kwargs):
+            bound_kwargs.update(kwargs)
+            return self
+
+        async def ainvoke(self, prompt):
+            return _Reply()
+
+    monkeypatch.setattr(ai, "model", _Model())
+    result = asyncio.run(ai.aget_recommendations_ai(1, "AI", "BSc", []))
+
+    assert bound_kwargs == {"response_format": {"type": "json_object"}}
+    assert json.loads(result) == [{"Number": 1, "Course Code": "CPSC 483"}]
+
+
+def test_main_int_ai_reuses_initialized_client(monkeypatch, valid_api_key):
+    """A second call keeps the client and prompt template built by the first."""
+    monkeypatch.setattr(ai, "model", None)
+    monkeypatch.setattr(ai, "prompt_template", None)
+    assert ai.main_int_ai() is True
+    first_model, first_template = ai.model, ai.prompt_template
+
+    assert ai.main_int_ai() is True
+    assert ai.model is first_model
+    assert ai.prompt_template is first_template
+
+
+def test_dumps_json_round_trips_with_two_space_indent():
+    courses = [{"Number": 1, "Course Name": "Café Systems", "Rating": 95}]
+    text = ai._dumps_json(courses)
+    assert text.startswith('[\n  {\n    "Number": 1')
+    assert ai._loads_json(text) == courses
+
+
+# ----------------------------- real_chatgpt_response -----------------------------
+def test_real_chatgpt_response_json_mode(monkeypatch, tmp_path, valid_api_key):
+    """Default real mode asks for a JSON object and reads courses from it directly."""
+    assert ai.main_int_ai() is True
+    monkeypatch.chdir(tmp_path)
+    bound_kwargs = {}
+
+    class _Reply:
+        content = json.dumps(
+            {
+                "courses": [
+                    {
+                        "Number": 1,
+                        "Course Code": "CPSC 483",
+                        "Rating": 100,
+                        "Prerequisites": "Need to take: CPSC 335, MATH 338",
+                    }
+                ]
+            }
+        )
+
+    class _Model:
+        def bind(self, **kwargs):
+            bound_kwargs.update(kwargs)
+            return self
+
+        def invoke(self, prompt):
+            return _Reply()
+
+    monkeypatch.setattr(ai, "model", _Model())
+    result = json.loads(ai.real_chatgpt_response(1, "AI", "BSc", []))
+
+    assert bound_kwargs == {"response_format": {"type": "json_object"}}
+    assert result == [
+        {
+            "Number": 1,
+            "Course Code": "CPSC 483",
+            "Rating": 100,
+            "Prerequisites": "CPSC 335, MATH 338",
+        }
+    ]
+    assert json.loads((tmp_path / "courses.json").read_text("utf-8")) == result
+
+
+def test_real_chatgpt_response_legacy_markdown(monkeypatch, tmp_path, valid_api_key):
+    """AI_LEGACY_MARKDOWN=1 streams the markdown reply through the line parser."""
+    monkeypatch.setenv("AI_LEGACY_MARKDOWN", "1")
+    assert ai.main_int_ai() is True
+    monkeypatch.chdir(tmp_path)
+
+    class _Chunk:
+        def __init__(self, content):
+            self.content = content
+
+    class _Model:
+        def stream(self, prompt):
+            yield _Chunk("**Number:** 1\n**Course Code:** CPSC 483\n")
+            yield _Chunk("**Prerequisites:** Completed: CPSC 335\n")
+
+    monkeypatch.setattr(ai, "model", _Model())
+    result = json.loads(ai.real_chatgpt_response(1, "AI", "BSc", []))
+
+    assert result == [
+        {"Number": 1, "Course Code": "CPSC 483", "Prerequisites": "CPSC 335"}
+    ]
+
+
+def test_real_chatgpt_response_cache_skips_repeat_model_calls(
+    monkeypatch, tmp_path, valid_api_key
+):
+    """With AI_CACHE_ENABLED, an identical request is served from the SQLite cache."""
+    monkeypatch.setenv("AI_CACHE_ENABLED", "1")
+    monkeypatch.setenv("AI_CACHE_PATH", str(tmp_path / "cache" / "llm.db"))
+    assert ai.main_int_ai() is True
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    class _Reply:
+        content = '{"courses": [{"Number": 1, "Course Code": "CPSC 483"}]}'
+
+    class _Model:
+        def bind(self, **kwargs):
+            return self
+
+        def invoke(self, prompt):
+            calls.append(prompt)
+            return _Reply()
+
+    monkeypatch.setattr(ai, "model", _Model())
+    electives = [
+        {
+            "prerequisites": "None",
+            "course_code": "CPSC 483",
+            "units": 3,
+            "name": "ML",
+            "description": "d",
+        }
+    ]
+
+    first = ai.real_chatgpt_response(1, "AI", "BSc", electives)
+    second = ai.real_chatgpt_response(1, "AI", "BSc", electives)
+    assert second == first
+    assert len(calls) == 1
+
+    ai.real_chatgpt_response(1, "Web", "BSc", electives)
+    assert len(calls) == 2
+
+    # A cache hit still refreshes courses.json (the "Web" call overwrote it)
+    (tmp_path / "courses.json").write_text("[]", encoding="utf-8")
+    assert ai.real_chatgpt_response(1, "AI", "BSc", electives) == first
+    assert len(calls) == 2
+    assert (tmp_path / "courses.json").read_text("utf-8") == first
+
+
+def test_build_prompt_reuses_rendered_prompt(valid_api_key):
+    """Identical (job, degree, electives) inputs render the prompt only once."""
+    assert ai.main_int_ai() is True
+    electives = [
+        {
+            "prerequisites": "CPSC 335 or MATH 338",
+            "course_code": "CPSC 483",
+            "units": 3,
+            "name": "ML",
+            "description": "d",
+        }
+    ]
+    key = ai._electives_key(electives)
+
+    first = ai._build_prompt(False, "AI", "BSc", key)
+    second = ai._build_prompt(False, "AI", "BSc", ai._electives_key(electives))
+    assert second is first
+    assert "CPSC 335 or MATH 338,,,CPSC 483,3,ML,d" in first.to_string()
+    assert ai._build_prompt(True, "AI", "BSc", key) is not first
+
+
+def test_write_courses_json_skips_unchanged_and_replaces_atomically(
+    monkeypatch, tmp_path
+):
+    """Identical bytes are not rewritten; changed bytes replace the file."""
+    monkeypatch.chdir(tmp_path)
+    target = tmp_path / "courses.json"
+
+    assert ai._write_courses_json(b'[{"Number": 1}]') is True
+    assert ai._write_courses_json(b'[{"Number": 1}]') is False
+    assert target.read_bytes() == b'[{"Number": 1}]'
+
+    assert ai._write_courses_json(b'[{"Number": 2}]') is True
+    assert target.read_bytes() == b'[{"Number": 2}]'
+    assert not (tmp_path / "courses.json.tmp").exists()
+
+    # Edited or deleted on disk since the last write -> written again
+    target.write_bytes(b"[]")
+    assert ai._write_courses_json(b'[{"Number": 2}]') is True
+    target.unlink()
+    assert ai._write_courses_json(b'[{"Number": 2}]') is True
+    assert target.read_bytes() == b'[{"Number": 2}]'
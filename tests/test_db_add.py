@@ -0,0 +1,80 @@
+# tests/test_db_add.py
+# poetry run pytest -q tests/test_db_add.py
+
+
+import sqlite3
+
+import pytest
+
+from database import db_add
+
+SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    phone TEXT,
+    specialization TEXT,
+    password_hash TEXT NOT NULL
+);
+CREATE TABLE electives (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_code TEXT NOT NULL,
+    course_title TEXT NOT NULL,
+    category_id INTEGER NOT NULL,
+    credits INTEGER NOT NULL,
+    description TEXT,
+    prerequisites TEXT
+);
+CREATE TABLE feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    elective_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    comment TEXT NOT NULL,
+    rating REAL,
+    FOREIGN KEY (elective_id) REFERENCES electives(id),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "add.sqlite")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.close()
+    return path
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_db_session_commits_adds_once_at_the_end(db_path):
+    with db_add.db_session(db_path) as conn:
+        user_id = db_add.add_user(
+            "Luna", "Dev", "luna@example.com", "555", "Cyber", "h", conn=conn
+        )
+        elective_id = db_add.add_elective(
+            "CPSC 452", "Crypto", 1, 3, "d", "None", conn=conn
+        )
+        assert db_add.add_feedback(user_id, elective_id, "Great", 4.5, conn=conn) == 1
+        # nothing visible to other connections until the session ends
+        assert _count(db_path, "users") == 0
+
+    assert [_count(db_path, t) for t in ("users", "electives", "feedback")] == [1, 1, 1]
+
+
+def test_db_session_rolls_back_on_error(db_path):
+    with pytest.raises(RuntimeError):
+        with db_add.db_session(db_path) as conn:
+            db_add.add_elective("CPSC 452", "Crypto", 1, 3, "d", "None", conn=conn)
+            raise RuntimeError("boom")
+
+    assert _count(db_path, "electives") == 0
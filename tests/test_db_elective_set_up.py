@@ -0,0 +1,35 @@
+# tests/test_db_elective_set_up.py
+# poetry run pytest -q tests/test_db_elective_set_up.py
+
+
+import runpy
+import sqlite3
+
+import pytest
+
+from database import db_elective_set_up, db_setup
+
+
+def test_import_electives_loads_default_courses_csv(tmp_path, monkeypatch):
+    """The default courses.csv maps onto the electives table DB_table_setup creates."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / db_setup.DB_DIRNAME).mkdir()
+    try:
+        runpy.run_module("database.DB_table_setup", run_name="__main__")
+        assert db_elective_set_up.import_electives() == 75
+
+        conn = db_setup.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM electives;").fetchone()[0] == 75
+        assert conn.execute(
+            "SELECT course_code, course_title, category_id, credits FROM electives"
+            " WHERE course_code = 'CPSC 120';"
+        ).fetchone() == ("CPSC 120", "Introduction to Programming", 1, 3)
+    finally:
+        db_setup.close_connections()
+
+
+def test_import_electives_raises_sqlite_error_when_db_cannot_open(tmp_path):
+    """get_conn surfaces an unopenable db as sqlite3.Error, not AttributeError."""
+    db_file = str(tmp_path / "missing_dir" / "ai_advice.db")
+    with pytest.raises(sqlite3.Error):
+        db_elective_set_up.import_electives(db_path=db_file)
@@ -1,4 +1,9 @@
 import os
+import runpy
+import sqlite3
+import threading
+
+import pytest
 
 from database import db_setup
 
@@ -29,3 +34,456 @@ def test_main_test_db_option_3_tempfile(tmp_path):
     the lower-level helpers with a path you control, see the example below.
     """
     assert db_setup.main_test_db(3) is True
+
+
+def test_populate_all_reference_data_loads_csvs_once(tmp_path):
+    """
+    Populating a fresh file DB loads every reference CSV and leaves no open
+    transaction; a second run sees the filled tables and inserts nothing.
+    """
+    conn = db_setup.create_connection(str(tmp_path / "ref.sqlite"))
+    try:
+        db_setup.create_tables(conn)
+        db_setup.populate_all_reference_data(conn)
+        assert not conn.in_transaction
+
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+            for table in ("Colleges", "Departments", "Degrees", "Courses", "Jobs")
+        }
+        assert counts == {
+            "Colleges": 8,
+            "Departments": 61,
+            "Degrees": 385,
+            "Courses": 75,
+            "Jobs": 20,
+        }
+
+        db_setup.populate_all_reference_data(conn)
+        assert conn.execute("SELECT COUNT(*) FROM Courses;").fetchone()[0] == 75
+    finally:
+        conn.close()
+
+
+def test_populate_splits_inserts_into_batches(tmp_path, monkeypatch):
+    """A batch size smaller than the CSV still loads every row."""
+    monkeypatch.setattr(db_setup, "INSERT_BATCH_SIZE", 7)
+    conn = db_setup.create_connection(str(tmp_path / "batched.sqlite"))
+    try:
+        db_setup.create_tables(conn)
+        db_setup.populate_all_reference_data(conn)
+        assert conn.execute("SELECT COUNT(*) FROM Degrees;").fetchone()[0] == 385
+        assert conn.execute("SELECT COUNT(*) FROM Courses;").fetchone()[0] == 75
+    finally:
+        conn.close()
+
+
+def test_batched_accepts_generators():
+    batches = list(db_setup._batched((i for i in range(7)), 3))
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(db_setup._batched([], 3)) == []
+
+
+def test_insert_rows_uses_given_batch_size():
+    conn = db_setup.create_connection(":memory:")
+    try:
+        conn.execute("CREATE TABLE t (x INTEGER);")
+        conn.commit()
+        db_setup._insert_rows(
+            conn.cursor(), "INSERT INTO t (x) VALUES (?);", ((i,) for i in range(5)), 2
+        )
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM t;").fetchone()[0] == 5
+    finally:
+        conn.close()
+
+
+def test_create_connection_uses_wal_and_normal_sync(tmp_path):
+    conn = db_setup.create_connection(str(tmp_path / "pragmas.sqlite"))
+    try:
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        # 1 == NORMAL
+        assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1
+        assert conn.execute("PRAGMA locking_mode;").fetchone()[0] == "normal"
+    finally:
+        conn.close()
+
+
+def test_create_connection_closes_conn_when_a_pragma_fails(tmp_path, monkeypatch):
+    opened = []
+
+    class _LockedConnection:
+        def __init__(self, *args, **kwargs):
+            self.closed = False
+            opened.append(self)
+
+        def execute(self, sql, *args):
+            if "journal_mode" in sql:
+                raise db_setup.sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(db_setup.sqlite3, "connect", _LockedConnection)
+    assert db_setup.create_connection(str(tmp_path / "locked.sqlite")) is None
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_create_connection_bulk_load_locks_exclusively(tmp_path):
+    db_file = str(tmp_path / "bulk.sqlite")
+    conn = db_setup.create_connection(db_file, bulk_load=True)
+    try:
+        assert conn.execute("PRAGMA locking_mode;").fetchone()[0] == "exclusive"
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        db_setup.create_tables(conn)
+    finally:
+        conn.close()
+
+    # Closing releases the lock for ordinary connections
+    conn = db_setup.create_connection(db_file)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM Colleges;").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_load_csv_skips_empty_and_non_numeric_rows(tmp_path, monkeypatch, caplog):
+    (tmp_path / "colleges.csv").write_text(
+        "college_id,name\n1, Engineering \n,No Id\nx,Bad Id\n2,\n\n4\n3,Arts\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(db_setup, "_SCRIPT_DIR", tmp_path)
+    conn = db_setup.create_connection(":memory:")
+    try:
+        db_setup.create_tables(conn)
+        db_setup.populate_colleges_data(conn)
+        assert conn.execute(
+            "SELECT college_id, name FROM Colleges ORDER BY college_id;"
+        ).fetchall() == [(1, "Engineering"), (3, "Arts")]
+        assert "Skipped 4 malformed rows in colleges.csv." in caplog.text
+    finally:
+        conn.close()
+
+
+def test_create_tables_indexes_preference_and_recommendation_fks():
+    conn = db_setup.create_connection(":memory:")
+    try:
+        db_setup.create_tables(conn)
+        names = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index';"
+            )
+        }
+        assert {
+            "idx_user_preferences_user",
+            "idx_user_preferences_degree",
+            "idx_user_preferences_job",
+            "idx_recommendations_user_rank",
+            "idx_recommendations_job",
+            "idx_recommendations_course",
+        } <= names
+    finally:
+        conn.close()
+
+
+def test_get_connection_reuses_one_connection_across_threads(tmp_path):
+    db_file = str(tmp_path / "shared.sqlite")
+    try:
+        conn = db_setup.get_connection(db_file)
+        assert db_setup.get_connection(db_file) is conn
+
+        seen = []
+        worker = threading.Thread(
+            target=lambda: seen.append(
+                db_setup.get_connection(db_file).execute("SELECT 1;").fetchone()[0]
+            )
+        )
+        worker.start()
+        worker.join()
+        assert seen == [1]
+    finally:
+        db_setup.close_connections()
+    assert db_setup.get_connection(db_file) is not conn
+    db_setup.close_connections()
+
+
+def test_populate_all_reference_data_stamps_user_version(tmp_path, monkeypatch):
+    conn = db_setup.create_connection(str(tmp_path / "stamped.sqlite"))
+    try:
+        db_setup.create_tables(conn)
+        db_setup.populate_all_reference_data(conn)
+        assert (
+            conn.execute("PRAGMA user_version;").fetchone()[0]
+            == db_setup.REFERENCE_DATA_VERSION
+        )
+
+        def fail(conn):
+            raise AssertionError("loader ran on a stamped database")
+
+        monkeypatch.setattr(db_setup, "populate_colleges_data", fail)
+        db_setup.populate_all_reference_data(conn)
+    finally:
+        conn.close()
+
+
+def test_split_course_name_matches_csv_layouts():
+    split = db_setup._split_course_name
+    assert split("CPSC 120, Introduction to Programming, (3)") == (
+        "CPSC 120",
+        "Introduction to Programming",
+        "3",
+    )
+    assert split("PHYS 227L, Fundamental Physics: Laboratory, (1)") == (
+        "PHYS 227L",
+        "Fundamental Physics: Laboratory",
+        "1",
+    )
+    assert split("CPSC 352, Cryptography") == ("CPSC 352", "Cryptography", None)
+    assert split("CPSC 352") == ("CPSC 352", "CPSC 352", None)
+
+
+def test_load_csv_uses_multi_row_inserts(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_setup, "_MULTI_ROW_MAX_ROWS", 3)
+    monkeypatch.setitem(
+        db_setup._CSV_TABLE_MULTI_INSERTS,
+        "Colleges",
+        db_setup._multi_row_insert(db_setup._CSV_TABLE_INSERTS["Colleges"], 2),
+    )
+    conn = db_setup.create_connection(str(tmp_path / "multi.sqlite"))
+    statements = []
+    try:
+        db_setup.create_tables(conn)
+        conn.set_trace_callback(statements.append)
+        db_setup._load_csv(conn, "Colleges")
+        conn.set_trace_callback(None)
+
+        inserts = [sql for sql in statements if sql.lstrip().startswith("INSERT")]
+        # 8 colleges: two 3-row statements, then 2 single-row leftovers
+        assert len(inserts) == 4
+        assert conn.execute("SELECT COUNT(*) FROM Colleges;").fetchone()[0] == 8
+    finally:
+        conn.close()
+
+
+def test_populate_prerequisites_resolves_codes_from_courses(tmp_path, monkeypatch):
+    (tmp_path / "prerequisites.csv").write_text(
+        "course_code,prerequisite_course_code\n"
+        "CPSC 121,CPSC 120\n"
+        "CPSC 131,CPSC 121\n"
+        "CPSC 999,CPSC 120\n"
+        "CPSC 131,\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(db_setup, "_SCRIPT_DIR", tmp_path)
+    conn = db_setup.create_connection(":memory:")
+    try:
+        db_setup.create_tables(conn)
+        conn.execute("INSERT INTO Colleges (college_id, name) VALUES (1, 'C');")
+        conn.execute(
+            "INSERT INTO Departments (department_id, college_id, name)"
+            " VALUES (1, 1, 'D');"
+        )
+        conn.execute(
+            "INSERT INTO Degree_Levels (degree_level_id, department_id, name)"
+            " VALUES (1, 1, 'L');"
+        )
+        conn.execute(
+            "INSERT INTO Degrees (degree_id, degree_level_id, name) VALUES (1, 1, 'G');"
+        )
+        conn.execute(
+            "INSERT INTO Requirements (degree_id, type, name) VALUES (1, 'core', 'R');"
+        )
+        conn.execute(
+            "INSERT INTO Subcategories (requirement_id, name) VALUES (1, 'S');"
+        )
+        conn.executemany(
+            "INSERT INTO Courses (subcategory_id, course_code, name) VALUES (1, ?, ?);",
+            [("CPSC 120", "A"), ("CPSC 121", "B"), ("CPSC 131", "C")],
+        )
+        conn.commit()
+
+        db_setup.populate_prerequisites_data(conn)
+        pairs = conn.execute(
+            "SELECT c.course_code, p.course_code FROM Prerequisites"
+            " JOIN Courses c ON c.course_id = Prerequisites.course_id"
+            " JOIN Courses p ON p.course_id = Prerequisites.prerequisite_course_id"
+            " ORDER BY 1;"
+        ).fetchall()
+        assert pairs == [("CPSC 121", "CPSC 120"), ("CPSC 131", "CPSC 121")]
+    finally:
+        conn.close()
+
+
+def test_course_code_lookups_use_an_index():
+    conn = db_setup.create_connection(":memory:")
+    try:
+        db_setup.create_tables(conn)
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT course_id FROM Courses WHERE course_code = ?;",
+            ("CPSC 120",),
+        ).fetchall()
+        assert any("INDEX" in row[-1] for row in plan)
+    finally:
+        conn.close()
+
+
+def test_populated_tables_probes_every_reference_table(tmp_path):
+    conn = db_setup.create_connection(str(tmp_path / "probe.sqlite"))
+    try:
+        db_setup.create_tables(conn)
+        assert db_setup._populated_tables(conn) == dict.fromkeys(
+            db_setup._REFERENCE_TABLES, False
+        )
+
+        db_setup.populate_all_reference_data(conn)
+        populated = db_setup._populated_tables(conn)
+        # prerequisites.csv is not shipped, so only that table stays empty
+        assert [t for t, flag in populated.items() if not flag] == ["Prerequisites"]
+
+        # Without the user_version stamp, filled tables are still skipped
+        conn.execute("PRAGMA user_version = 0;")
+        db_setup.populate_all_reference_data(conn)
+        assert conn.execute("SELECT COUNT(*) FROM Courses;").fetchone()[0] == 75
+    finally:
+        conn.close()
+
+
+def test_populate_jobs_skips_short_and_blank_rows(tmp_path, monkeypatch, caplog):
+    (tmp_path / "jobs.csv").write_text(
+        "job_id,degree_id,name,description\n"
+        "1,1,Data Engineer,Pipelines\n"
+        "\n"
+        "2,1\n"
+        "3,1,Game Developer,\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(db_setup, "_SCRIPT_DIR", tmp_path)
+    conn = db_setup.create_connection(":memory:")
+    try:
+        db_setup.create_tables(conn)
+        conn.executescript(
+            """
+            INSERT INTO Colleges (college_id, name) VALUES (1, 'C');
+            INSERT INTO Departments (department_id, college_id, name)
+                VALUES (1, 1, 'D');
+            INSERT INTO Degree_Levels (degree_level_id, department_id, name)
+                VALUES (1, 1, 'L');
+            INSERT INTO Degrees (degree_id, degree_level_id, name)
+                VALUES (1, 1, 'G');
+            """
+        )
+
+        with caplog.at_level("WARNING", logger="database.db_setup"):
+            db_setup.populate_jobs_data(conn)
+
+        assert conn.execute("SELECT job_id, name FROM Jobs ORDER BY 1;").fetchall() == [
+            (1, "Data Engineer"),
+            (3, "Game Developer"),
+        ]
+        assert "Skipped 1 malformed rows in jobs.csv." in caplog.text
+    finally:
+        conn.close()
+
+
+def test_create_tables_after_db_table_setup(tmp_path, monkeypatch):
+    """
+    DB_table_setup.py's legacy recommendations table (no rank/job_id/course_id)
+    must not abort create_tables on the same db file.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / db_setup.DB_DIRNAME).mkdir()
+    db_file = str(tmp_path / db_setup.DB_DIRNAME / db_setup.DB_FILENAME)
+    try:
+        runpy.run_module("database.DB_table_setup", run_name="__main__")
+    finally:
+        db_setup.close_connections()
+
+    conn = db_setup.create_connection(db_file)
+    try:
+        db_setup.create_tables(conn)
+        tables = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table';"
+            )
+        }
+        assert {"Colleges", "Courses", "Prerequisites", "User_Interactions"} <= tables
+        db_setup.populate_all_reference_data(conn)
+        assert conn.execute("SELECT COUNT(*) FROM Courses;").fetchone()[0] == 75
+    finally:
+        conn.close()
+
+
+def test_db_table_setup_rolls_back_a_failed_script(tmp_path, monkeypatch):
+    """A failing CREATE must not leave the shared connection mid-transaction."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / db_setup.DB_DIRNAME).mkdir()
+    try:
+        conn = db_setup.get_connection()
+        # clashes with the script's CREATE INDEX idx_electives_code
+        conn.execute("CREATE TABLE idx_electives_code (id INTEGER);")
+        conn.commit()
+        runpy.run_module("database.DB_table_setup", run_name="__main__")
+
+        assert not conn.in_transaction
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'users';"
+        ).fetchone()[0] == 0
+    finally:
+        db_setup.close_connections()
+
+
+def test_failed_load_is_not_stamped_and_retries(tmp_path, monkeypatch):
+    real_dir = db_setup._SCRIPT_DIR
+    empty_dir = tmp_path / "no_csvs"
+    empty_dir.mkdir()
+    conn = db_setup.create_connection(str(tmp_path / "partial.sqlite"))
+    try:
+        db_setup.create_tables(conn)
+
+        monkeypatch.setattr(db_setup, "_SCRIPT_DIR", empty_dir)
+        assert db_setup.populate_colleges_data(conn) is False
+        db_setup.populate_all_reference_data(conn)
+        assert conn.execute("PRAGMA user_version;").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM Colleges;").fetchone()[0] == 0
+
+        monkeypatch.setattr(db_setup, "_SCRIPT_DIR", real_dir)
+        db_setup.populate_all_reference_data(conn)
+        assert conn.execute("SELECT COUNT(*) FROM Colleges;").fetchone()[0] == 8
+        assert (
+            conn.execute("PRAGMA user_version;").fetchone()[0]
+            == db_setup.REFERENCE_DATA_VERSION
+        )
+    finally:
+        conn.close()
+
+
+def test_main_int_db_falls_back_when_bulk_lock_is_unavailable(tmp_path, monkeypatch):
+    """main_int_db still builds the schema if the exclusive bulk-load open fails."""
+    monkeypatch.chdir(tmp_path)
+    real_create = db_setup.create_connection
+    bulk_flags = []
+
+    def _create(db_file, check_same_thread=True, bulk_load=False):
+        bulk_flags.append(bulk_load)
+        if bulk_load:
+            return None
+        return real_create(db_file, check_same_thread, bulk_load)
+
+    monkeypatch.setattr(db_setup, "create_connection", _create)
+    db_setup.main_int_db("fallback.db")
+
+    assert bulk_flags == [True, False]
+    conn = real_create(str(tmp_path / db_setup.DB_DIRNAME / "fallback.db"))
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM Courses;").fetchone()[0] == 75
+    finally:
+        conn.close()
+
+
+def test_main_int_db_raises_when_no_connection_opens(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(db_setup, "create_connection", lambda *a, **k: None)
+    with pytest.raises(sqlite3.Error):
+        db_setup.main_int_db("never.db")
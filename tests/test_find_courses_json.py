@@ -8,3 +8,51 @@ def test_find_courses_json_prefers_cwd(tmp_path, monkeypatch):
     (tmp_path / "courses.json").write_text("[]", encoding="utf-8")
     monkeypatch.chdir(tmp_path)
     assert _find_courses_json() == tmp_path / "courses.json"
+
+
+def test_find_courses_json_cached_until_invalidated(tmp_path, monkeypatch):
+    from ai_integration import ai_module as ai
+
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    for d in (first, second):
+        d.mkdir()
+        (d / "courses.json").write_text("[]", encoding="utf-8")
+
+    monkeypatch.chdir(first)
+    assert ai._find_courses_json_cached() == first / "courses.json"
+
+    monkeypatch.chdir(second)
+    assert ai._find_courses_json_cached() == first / "courses.json"
+
+    ai._invalidate_courses_json_cache()
+    assert ai._find_courses_json_cached() == second / "courses.json"
+
+
+
+def test_find_courses_json_cached_reprobes_a_missing_path(tmp_path, monkeypatch):
+    from ai_integration import ai_module as ai
+
+    monkeypatch.setattr(ai, "_PACKAGE_COURSES_JSON_CANDIDATES", ())
+    monkeypatch.setattr(ai, "_PACKAGE_COURSES_JSON_CANDIDATE_STRS", ())
+    monkeypatch.chdir(tmp_path)
+    # Not found yet: the fallback path is returned but not pinned
+    assert ai._find_courses_json_cached() == tmp_path / "courses.json"
+
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "courses.json").write_text("[]", encoding="utf-8")
+    monkeypatch.chdir(other)
+    assert ai._find_courses_json_cached() == other / "courses.json"
+
+    # A remembered file that disappears is looked up again as well
+    (other / "courses.json").unlink()
+    (tmp_path / "courses.json").write_text("[]", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    assert ai._find_courses_json_cached() == tmp_path / "courses.json"
+
+def test_find_courses_json_skips_directory_named_courses_json(tmp_path, monkeypatch):
+    (tmp_path / "courses.json").mkdir()
+    monkeypatch.chdir(tmp_path)
+    # A directory is not a data file, so the search moves on to the project root.
+    assert _find_courses_json() == Path(__file__).resolve().parents[1] / "courses.json"
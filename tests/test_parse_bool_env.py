@@ -14,3 +14,9 @@ def test_parse_bool_default(monkeypatch):
     monkeypatch.delenv("X", raising=False)
     assert parse_bool_env("X", default=True) is True
     assert parse_bool_env("X", default=False) is False
+
+
+def test_parse_bool_set_but_not_truthy_ignores_default(monkeypatch):
+    for v in ["0", "false", "no", "", "  ", "maybe"]:
+        monkeypatch.setenv("X", v)
+        assert parse_bool_env("X", default=True) is False
@@ -136,3 +136,79 @@ def test_parse_course_data_gracefully_handles_unknown_keys():  # Added Code
     assert len(courses) == 1  # Added Code
     c = courses[0]  # Added Code
     assert c["Instructor"] == "Dr. Smith"  # Added Code
+
+
+def test_extract_starred_lines_strips_prerequisite_status_label():
+    from ai_integration.ai_module import extract_starred_lines
+
+    text = (
+        "Intro paragraph without stars\n"
+        "  **Number:** 1  \n"
+        "**Prerequisites:** Need to take: CPSC 335, MATH 338\n"
+        "**Prerequisites:** None\n"
+    )
+    assert extract_starred_lines(text) == [
+        "**Number:** 1",
+        "**Prerequisites:** CPSC 335, MATH 338",
+        "**Prerequisites:** None",
+    ]
+
+
+def test_collect_streamed_reply_handles_lines_split_across_chunks():
+    from types import SimpleNamespace
+
+    from ai_integration.ai_module import _collect_streamed_reply, extract_starred_lines
+
+    text = (
+        "Here you go:\n"
+        "**Number:** 1\n"
+        "**Course Code:** CPSC 483\n"
+        "**Prerequisites:** Need to take: CPSC 335\n"
+        "**Number:** 2"
+    )
+    pieces = [
+        "Here ",
+        "you go:\n**Num",
+        "ber:** 1\n**Course Code:** CP",
+        "SC 483\n",
+        "",
+        "**Prerequisites:** Need to take: CPSC 335\n**Number:** 2",
+    ]
+    chunks = [SimpleNamespace(content=p) for p in pieces]
+
+    content, starred = _collect_streamed_reply(chunks)
+    assert content == text
+    assert starred == extract_starred_lines(text)
+    assert parse_course_data(starred)[0]["Prerequisites"] == "CPSC 335"
+
+
+def test_parse_course_data_ignores_continuation_lines_of_other_keys():
+    courses = parse_course_data(
+        [
+            "**Number:** 1",
+            "**Explanation:** First line",
+            "second *line*",
+            "**Prerequisites:** CPSC 131",
+            "stray *note*",
+        ]
+    )
+    assert courses == [
+        {
+            "Number": 1,
+            "Explanation": "First line second *line*",
+            "Prerequisites": "CPSC 131",
+        }
+    ]
+
+
+def test_parse_course_data_keeps_non_numeric_number_and_rating_as_text(caplog):
+    courses = parse_course_data(
+        [
+            "**Number:** 1",
+            "**Rating:** High",
+            "**Number:** two",
+            "**Rating:** -5",
+        ]
+    )
+    assert courses == [{"Number": 1, "Rating": "High"}, {"Number": "two", "Rating": -5}]
+    assert "Non-numeric course Number" in caplog.text
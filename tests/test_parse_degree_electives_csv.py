@@ -0,0 +1,80 @@
+# tests/test_parse_degree_electives_csv.py
+from ai_integration.ai_module import _parse_degree_electives_csv
+
+
+def test_parse_degree_electives_csv_normalizes_rows():
+    csv_text = (
+        'CPSC 335,MATH 338,,CPSC 483,3,Introduction to Machine Learning,"Design, implement"\n'
+        "\n"
+        ",,,,,,\n"
+        " CPSC 131 ,,,CPSC 349 ,x, Web Front-End Engineering \n"
+    )
+    rows = _parse_degree_electives_csv(csv_text)
+    assert rows == [
+        {
+            "prerequisites": "CPSC 335 or MATH 338",
+            "course_code": "CPSC 483",
+            "units": 3,
+            "name": "Introduction to Machine Learning",
+            "description": "Design, implement",
+        },
+        {
+            "prerequisites": "CPSC 131",
+            "course_code": "CPSC 349",
+            "units": None,
+            "name": "Web Front-End Engineering",
+            "description": "",
+        },
+    ]
+
+
+def test_parse_degree_electives_csv_truncates_extra_columns():
+    rows = _parse_degree_electives_csv("A,B,C,CPSC 1,3,Name,Desc,extra,more\n")
+    assert len(rows) == 1
+    assert rows[0]["course_code"] == "CPSC 1"
+    assert rows[0]["description"] == "Desc"
+
+
+def test_parse_degree_electives_csv_empty_text():
+    assert _parse_degree_electives_csv("") == []
+
+
+def test_parse_degree_electives_csv_accepts_text_stream(tmp_path):
+    csv_file = tmp_path / "electives.csv"
+    csv_file.write_text(
+        ",,,CPSC 301,2,Programming Lab Practicum ,Intensive\n", encoding="utf-8"
+    )
+    with csv_file.open("r", encoding="utf-8", newline="") as f:
+        rows = _parse_degree_electives_csv(f)
+    assert rows == [
+        {
+            "prerequisites": "None",
+            "course_code": "CPSC 301",
+            "units": 2,
+            "name": "Programming Lab Practicum",
+            "description": "Intensive",
+        }
+    ]
+
+
+def test_parse_degree_electives_csv_prereqs_match_combine_prereqs():
+    from itertools import product
+
+    from ai_integration.ai_module import _combine_prereqs
+
+    shapes = list(product(["", "A"], ["", "B"], ["", "C"]))
+    csv_text = "\n".join(f"{a},{b},{c},CPSC 1,+3,Name,Desc" for a, b, c in shapes)
+    rows = _parse_degree_electives_csv(csv_text)
+    assert [r["prerequisites"] for r in rows] == [_combine_prereqs(*s) for s in shapes]
+    assert {r["units"] for r in rows} == {3}
+
+
+def test_combine_prereqs_shapes():
+    from ai_integration.ai_module import _combine_prereqs
+
+    assert _combine_prereqs(" CPSC 351 ", "CPSC 352", "CPSC 253") == (
+        "CPSC 351, CPSC 352 or CPSC 253"
+    )
+    assert _combine_prereqs("", "  ", "MATH 338") == "MATH 338"
+    assert _combine_prereqs(None, "CPSC 131", " MATH 150A") == "CPSC 131 or MATH 150A"
+    assert _combine_prereqs("", None, "   ") == "None"